@@ -22,12 +22,19 @@ from mcpvectordb.ingestor import ingest_content as _ingest_content
 from mcpvectordb.ingestor import ingest_folder as _ingest_folder
 from mcpvectordb.store import Store
 
+
 # ── Logging setup ──────────────────────────────────────────────────────────────
 # In stdio mode every byte on stdout corrupts MCP framing — log to stderr only.
-_log_handlers: list[logging.Handler] = []
-if settings.log_file:
-    _log_handlers.append(logging.FileHandler(Path(settings.log_file).expanduser()))
-_log_handlers.append(logging.StreamHandler(sys.stderr))
+def _init_log_handlers() -> list[logging.Handler]:
+    """Return the root log handlers: a FileHandler if log_file is set, then stderr."""
+    handlers: list[logging.Handler] = []
+    if settings.log_file:
+        handlers.append(logging.FileHandler(Path(settings.log_file).expanduser()))
+    handlers.append(logging.StreamHandler(sys.stderr))
+    return handlers
+
+
+_log_handlers = _init_log_handlers()
 
 logging.basicConfig(
     level=getattr(logging, settings.log_level.upper(), logging.INFO),
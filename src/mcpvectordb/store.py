@@ -7,6 +7,7 @@ from pathlib import Path
 
 import lancedb
 import numpy as np
+import pyarrow as pa
 from pydantic import BaseModel
 
 from mcpvectordb.config import settings
@@ -190,8 +191,17 @@ class Store:
             return
         try:
             table = self._table()
-            rows = [c.model_dump() for c in chunks]
-            table.add(rows)
+            rows = [c.model_dump(exclude={"embedding"}) for c in chunks]
+            # One float32 buffer for the batch, handed to LanceDB as a typed
+            # FixedSizeList column instead of a Python list per row
+            vectors = np.array([c.embedding for c in chunks], dtype=np.float32)
+            data = pa.Table.from_pylist(rows).append_column(
+                "embedding",
+                pa.FixedSizeListArray.from_arrays(
+                    pa.array(vectors.ravel()), vectors.shape[1]
+                ),
+            )
+            table.add(data)
             logger.info("Upserted %d chunks (doc_id=%s)", len(chunks), chunks[0].doc_id)
             try:
                 table.create_fts_index("content", replace=True)
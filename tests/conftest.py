@@ -1,5 +1,6 @@
 """Shared pytest fixtures for mcpvectordb tests."""
 
+from collections.abc import Iterator
 from pathlib import Path
 from unittest.mock import MagicMock
 
@@ -7,7 +8,7 @@ import numpy as np
 import pytest
 
 from mcpvectordb.config import settings
-from mcpvectordb.store import Store
+from mcpvectordb.store import Store, _open_table
 
 
 @pytest.fixture
@@ -16,10 +17,45 @@ def lancedb_dir(tmp_path: Path) -> Path:
     return tmp_path / "lancedb"
 
 
+@pytest.fixture(scope="session")
+def _shared_store(tmp_path_factory: pytest.TempPathFactory) -> Store:
+    """Store backed by one tmp LanceDB directory for the whole session (per worker)."""
+    uri = tmp_path_factory.mktemp("lancedb")
+    return Store(uri=str(uri), table_name="test_documents")
+
+
 @pytest.fixture
-def store(lancedb_dir: Path) -> Store:
-    """Fresh Store instance backed by a tmp LanceDB directory."""
-    return Store(uri=str(lancedb_dir), table_name="test_documents")
+def store(_shared_store: Store) -> Iterator[Store]:
+    """Session-shared tmp Store, emptied after each test so tests stay independent.
+
+    The table is created by the first write in the session and truncated rather
+    than rebuilt between tests.
+    """
+    yield _shared_store
+    # Only tests that wrote anything have created the table; skip opening it otherwise.
+    # Opened via _open_table so a test's patch of the instance's _table() can't
+    # break the cleanup.
+    if (Path(_shared_store._uri) / "test_documents.lance").exists():
+        _open_table(_shared_store._uri, "test_documents").delete("true")
+
+
+@pytest.fixture(scope="session")
+def stub_pdf(tmp_path_factory: pytest.TempPathFactory) -> Path:
+    """Placeholder .pdf written once per session for tests that never modify it.
+
+    Only the bytes are hashed; conversion is patched out, so the content need not
+    be a valid PDF.
+    """
+    path = tmp_path_factory.mktemp("stub") / "doc.pdf"
+    path.write_bytes(b"%PDF-1.4 minimal")
+    return path
+
+
+@pytest.fixture(scope="session")
+def query_embedding() -> list[float]:
+    """Random query vector shared by search tests that never assert on its value."""
+    rng = np.random.default_rng(1)
+    return rng.random(settings.embedding_dimension, dtype=np.float32).tolist()
 
 
 @pytest.fixture
@@ -28,13 +64,14 @@ def mock_embedder(monkeypatch: pytest.MonkeyPatch) -> MagicMock:
 
     Vector size matches settings.embedding_dimension to avoid schema mismatches.
     """
+    # Draw float32 directly rather than casting a float64 draw
+    rng = np.random.default_rng(0)
+    dim = settings.embedding_dimension
     embedder = MagicMock()
-    embedder.embed_documents.side_effect = lambda texts: np.random.rand(
-        len(texts), settings.embedding_dimension
-    ).astype(np.float32)
-    embedder.embed_query.return_value = np.random.rand(
-        settings.embedding_dimension
-    ).astype(np.float32)
+    embedder.embed_documents.side_effect = lambda texts: rng.random(
+        (len(texts), dim), dtype=np.float32
+    )
+    embedder.embed_query.return_value = rng.random(dim, dtype=np.float32)
     monkeypatch.setattr("mcpvectordb.embedder._instance", embedder)
     return embedder
 
@@ -1,6 +1,5 @@
 """Tests for cli.py — argument parsing and integration scenarios."""
 
-import asyncio
 from unittest.mock import MagicMock, patch
 
 import pytest
@@ -38,18 +37,6 @@ def _make_bulk_result(tmp_path, failed: int = 0, indexed: int = 1) -> BulkIngest
     )
 
 
-@pytest.fixture(autouse=True)
-def _patch_asyncio_run(monkeypatch):
-    """Replace asyncio.run() with run_until_complete() to preserve event loop.
-
-    asyncio.run() closes the event loop on completion, which breaks subsequent
-    tests that call asyncio.get_event_loop().run_until_complete(). This fixture
-    prevents that by reusing the existing event loop instead.
-    """
-    loop = asyncio.get_event_loop()
-    monkeypatch.setattr("asyncio.run", loop.run_until_complete)
-
-
 @pytest.mark.unit
 def test_cli_help_exits_cleanly():
     """--help prints usage and exits 0."""
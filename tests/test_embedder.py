@@ -1,61 +1,76 @@
 """Tests for embedder.py — embedding shape, batch behaviour, singleton, prefixes."""
 
+from types import SimpleNamespace
+from unittest.mock import MagicMock
+
+import fastembed
 import numpy as np
 import pytest
 
+import mcpvectordb.embedder as embedder_mod
 from mcpvectordb.config import settings
+from mcpvectordb.embedder import Embedder, get_embedder
+from mcpvectordb.exceptions import EmbeddingError
+
+_DOC_TEXTS = ["hello world", "test document", "single text", "machine learning"]
+
+
+@pytest.fixture(scope="session")
+def real_embeddings():
+    """Embed every text TestEmbedderShape needs once per session.
+
+    Returns (doc_vecs, single_doc_vecs, capital_query_vec, ml_query_vec);
+    doc_vecs rows follow _DOC_TEXTS, single_doc_vecs comes from a separate
+    one-text embed_documents call so the single-item batch path is exercised.
+    """
+    emb = get_embedder()
+    docs = emb.embed_documents(_DOC_TEXTS)
+    single = emb.embed_documents(["single text"])
+    qry = emb.embed_query("what is the capital of France?")
+    qry_ml = emb.embed_query("machine learning")
+    return docs, single, qry, qry_ml
 
 
+@pytest.mark.xdist_group("real_model")
 class TestEmbedderShape:
-    """Tests for vector dimensions and types (requires real model — slow)."""
+    """Tests for vector dimensions and types (requires real model — slow).
+
+    Grouped so ``--dist loadgroup`` loads the model on a single worker only.
+    """
 
     @pytest.mark.slow
-    def test_embed_documents_shape(self):
+    def test_embed_documents_shape(self, real_embeddings):
         """embed_documents returns array of shape (n, 768)."""
-        from mcpvectordb.embedder import get_embedder
-
-        emb = get_embedder()
-        result = emb.embed_documents(["hello world", "test document"])
-        assert result.shape == (2, 768)
-        assert result.dtype == np.float32
+        docs, _, _, _ = real_embeddings
+        assert docs.shape == (len(_DOC_TEXTS), 768)
+        assert docs.dtype == np.float32
 
     @pytest.mark.slow
-    def test_embed_query_shape(self):
+    def test_embed_query_shape(self, real_embeddings):
         """embed_query returns array of shape (768,)."""
-        from mcpvectordb.embedder import get_embedder
-
-        emb = get_embedder()
-        result = emb.embed_query("what is the capital of France?")
-        assert result.shape == (768,)
-        assert result.dtype == np.float32
+        _, _, qry, _ = real_embeddings
+        assert qry.shape == (768,)
+        assert qry.dtype == np.float32
 
     @pytest.mark.slow
-    def test_embed_single_document(self):
-        """embed_documents with one text returns shape (1, 768)."""
-        from mcpvectordb.embedder import get_embedder
-
-        result = get_embedder().embed_documents(["single text"])
-        assert result.shape == (1, 768)
+    def test_embed_single_document(self, real_embeddings):
+        """embed_documents with a one-text batch returns shape (1, 768)."""
+        _, single, _, _ = real_embeddings
+        assert single.shape == (1, 768)
 
     @pytest.mark.slow
     def test_embed_empty_list(self):
         """embed_documents with empty list returns empty array of correct width."""
-        from mcpvectordb.embedder import get_embedder
-
         result = get_embedder().embed_documents([])
         assert result.shape == (0, 768)
 
     @pytest.mark.slow
-    def test_query_and_document_embeddings_differ(self):
+    def test_query_and_document_embeddings_differ(self, real_embeddings):
         """Query and document embeddings for the same text differ (different prefix)."""
-        from mcpvectordb.embedder import get_embedder
-
-        emb = get_embedder()
-        text = "machine learning"
-        doc_vec = emb.embed_documents([text])[0]
-        qry_vec = emb.embed_query(text)
+        docs, _, _, qry_ml = real_embeddings
+        doc_vec = docs[_DOC_TEXTS.index("machine learning")]
         # They should not be identical due to different prefixes
-        assert not np.allclose(doc_vec, qry_vec)
+        assert not np.allclose(doc_vec, qry_ml)
 
 
 class TestEmbedderSingleton:
@@ -64,8 +79,6 @@ class TestEmbedderSingleton:
     @pytest.mark.unit
     def test_get_embedder_returns_same_instance(self, mock_embedder):
         """get_embedder() returns the same object on repeated calls."""
-        from mcpvectordb.embedder import get_embedder
-
         a = get_embedder()
         b = get_embedder()
         assert a is b
@@ -86,11 +99,8 @@ class TestEmbeddingError:
     @pytest.mark.unit
     def test_embed_documents_raises_on_model_failure(self, monkeypatch):
         """EmbeddingError is raised when the underlying model errors."""
-        from mcpvectordb.embedder import Embedder
-        from mcpvectordb.exceptions import EmbeddingError
-
         emb = object.__new__(Embedder)
-        model_mock = pytest.importorskip("unittest.mock").MagicMock()
+        model_mock = MagicMock()
         model_mock.embed.side_effect = RuntimeError("GPU OOM")
         emb._model = model_mock
         emb._batch_size = 32
@@ -105,12 +115,6 @@ class TestEmbedderUnit:
     @pytest.mark.unit
     def test_init_loads_sentence_transformer_and_stores_batch_size(self, monkeypatch):
         """Embedder.__init__ loads TextEmbedding and stores batch_size (lines 34-38)."""
-        from unittest.mock import MagicMock
-
-        import fastembed
-
-        from mcpvectordb.embedder import Embedder
-
         mock_model = MagicMock()
         mock_te_class = MagicMock(return_value=mock_model)
         monkeypatch.setattr(fastembed, "TextEmbedding", mock_te_class)
@@ -124,10 +128,6 @@ class TestEmbedderUnit:
     @pytest.mark.unit
     def test_embed_documents_empty_list_returns_zero_shape_without_model_call(self):
         """embed_documents([]) returns (0, 768) float32 array without calling model (line 55)."""
-        from unittest.mock import MagicMock
-
-        from mcpvectordb.embedder import Embedder
-
         emb = object.__new__(Embedder)
         emb._model = MagicMock()
         emb._batch_size = 32
@@ -141,14 +141,10 @@ class TestEmbedderUnit:
     @pytest.mark.unit
     def test_embed_documents_returns_float32_array(self):
         """embed_documents returns float32 array of shape (n, 768) on success (line 64)."""
-        from unittest.mock import MagicMock
-
-        from mcpvectordb.embedder import Embedder
-
         emb = object.__new__(Embedder)
-        mock_model = MagicMock()
-        mock_model.embed.return_value = [np.random.rand(768).astype(np.float32) for _ in range(2)]
-        emb._model = mock_model
+        # fastembed yields one row per text; iterating a 2-D array yields row views
+        vecs = np.empty((2, 768), dtype=np.float32)
+        emb._model = SimpleNamespace(embed=lambda *_a, **_k: iter(vecs))
         emb._batch_size = 32
 
         result = emb.embed_documents(["text one", "text two"])
@@ -159,14 +155,9 @@ class TestEmbedderUnit:
     @pytest.mark.unit
     def test_embed_query_returns_float32_vector(self):
         """embed_query returns float32 array of shape (768,) on success (lines 82-89)."""
-        from unittest.mock import MagicMock
-
-        from mcpvectordb.embedder import Embedder
-
         emb = object.__new__(Embedder)
-        mock_model = MagicMock()
-        mock_model.embed.return_value = [np.random.rand(768).astype(np.float32)]
-        emb._model = mock_model
+        vec = np.random.rand(768).astype(np.float32)
+        emb._model = SimpleNamespace(embed=lambda *_a, **_k: [vec])
         emb._batch_size = 32
 
         result = emb.embed_query("what is the capital?")
@@ -177,11 +168,6 @@ class TestEmbedderUnit:
     @pytest.mark.unit
     def test_embed_query_raises_embedding_error_on_model_failure(self):
         """embed_query raises EmbeddingError when the model raises (lines 90-91)."""
-        from unittest.mock import MagicMock
-
-        from mcpvectordb.embedder import Embedder
-        from mcpvectordb.exceptions import EmbeddingError
-
         emb = object.__new__(Embedder)
         mock_model = MagicMock()
         mock_model.encode.side_effect = RuntimeError("GPU OOM")
@@ -194,13 +180,7 @@ class TestEmbedderUnit:
     @pytest.mark.unit
     def test_get_embedder_creates_instance_when_none(self, monkeypatch):
         """get_embedder initialises a new Embedder when _instance is None (line 98)."""
-        from unittest.mock import MagicMock
-
-        import fastembed
-
-        import mcpvectordb.embedder as embedder_mod
-
-        monkeypatch.setattr(fastembed, "TextEmbedding", MagicMock())
+        monkeypatch.setattr(fastembed, "TextEmbedding", lambda **_k: SimpleNamespace())
         monkeypatch.setattr(embedder_mod, "_instance", None)
 
         result = embedder_mod.get_embedder()
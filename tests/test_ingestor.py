@@ -1,18 +1,29 @@
 """Tests for ingestor.py — pipeline, dedup scenarios, URL mocking."""
 
-import asyncio
 import json
+from unittest.mock import MagicMock
 
+import httpx
+import markitdown
 import numpy as np
 import pytest
 
 from mcpvectordb.exceptions import IngestionError, UnsupportedFormatError
-from mcpvectordb.ingestor import BulkIngestResult, IngestResult, ingest, ingest_folder
+from mcpvectordb.ingestor import (
+    BulkIngestResult,
+    IngestResult,
+    _convert_html_bytes,
+    _extract_title,
+    ingest,
+    ingest_folder,
+)
 
+# Shared by every patched chunk() call — ingest() only iterates the list.
+_CHUNKS = ["chunk one", "chunk two", "chunk three"]
 
-def run(coro):
-    """Run a coroutine synchronously in tests."""
-    return asyncio.get_event_loop().run_until_complete(coro)
+# One embedding row per _CHUNKS entry; read-only because ingest() only reads rows.
+_ZERO_EMBEDDINGS = np.zeros((len(_CHUNKS), 768), dtype=np.float32)
+_ZERO_EMBEDDINGS.setflags(write=False)
 
 
 @pytest.fixture
@@ -20,10 +31,20 @@ def _patch_chunker(monkeypatch):
     """Patch chunker.chunk to return three synthetic chunks without tokenizing."""
     monkeypatch.setattr(
         "mcpvectordb.ingestor.chunk",
-        lambda text: ["chunk one", "chunk two", "chunk three"] if text.strip() else [],
+        lambda text: _CHUNKS if text.strip() else [],
     )
 
 
+@pytest.fixture
+def _failing_stage(request, monkeypatch, _patch_converter):
+    """Make the (target, exception) pipeline stage in request.param raise.
+
+    Applied on top of _patch_converter so stages after conversion are reached.
+    """
+    target, exc = request.param
+    monkeypatch.setattr(target, MagicMock(side_effect=exc))
+
+
 @pytest.fixture
 def _patch_converter(monkeypatch):
     """Patch converter.convert to return synthetic Markdown."""
@@ -37,72 +58,70 @@ class TestIngestFile:
     """Tests for local file ingestion."""
 
     @pytest.mark.integration
-    def test_ingest_new_file(
-        self, tmp_path, store, mock_embedder, _patch_chunker, _patch_converter
+    async def test_ingest_new_file(
+        self, stub_pdf, store, mock_embedder, _patch_chunker, _patch_converter
     ):
         """Ingesting a new file returns status='indexed'."""
-        f = tmp_path / "doc.pdf"
-        f.write_bytes(b"%PDF-1.4 minimal")
-
-        result = run(ingest(source=f, library="default", metadata=None, store=store))
+        result = await ingest(
+            source=stub_pdf, library="default", metadata=None, store=store
+        )
 
         assert isinstance(result, IngestResult)
         assert result.status == "indexed"
         assert result.chunk_count == 3
         assert result.library == "default"
-        assert result.source == str(f)
+        assert result.source == str(stub_pdf)
 
     @pytest.mark.integration
-    def test_ingest_creates_chunks_in_store(
-        self, tmp_path, store, mock_embedder, _patch_chunker, _patch_converter
+    async def test_ingest_creates_chunks_in_store(
+        self, stub_pdf, store, mock_embedder, _patch_chunker, _patch_converter
     ):
         """After ingestion the store contains the correct number of chunks."""
-        f = tmp_path / "doc.pdf"
-        f.write_bytes(b"%PDF-1.4 minimal")
-
-        result = run(ingest(source=f, library="default", metadata=None, store=store))
+        result = await ingest(
+            source=stub_pdf, library="default", metadata=None, store=store
+        )
         chunks = store.get_document(result.doc_id)
         assert len(chunks) == 3
 
     @pytest.mark.integration
-    def test_ingest_stores_metadata(
-        self, tmp_path, store, mock_embedder, _patch_chunker, _patch_converter
+    async def test_ingest_stores_metadata(
+        self, stub_pdf, store, mock_embedder, _patch_chunker, _patch_converter
     ):
         """User-supplied metadata is preserved on every chunk."""
-        f = tmp_path / "doc.pdf"
-        f.write_bytes(b"%PDF-1.4 minimal")
         meta = {"author": "Alice", "year": "2025"}
 
-        result = run(ingest(source=f, library="default", metadata=meta, store=store))
+        result = await ingest(
+            source=stub_pdf, library="default", metadata=meta, store=store
+        )
         chunks = store.get_document(result.doc_id)
-        for c in chunks:
-            assert json.loads(c.metadata) == meta
+        assert all(json.loads(c.metadata) == meta for c in chunks)
 
     @pytest.mark.integration
-    def test_ingest_unsupported_format_raises(self, tmp_path, store, mock_embedder):
+    async def test_ingest_unsupported_format_raises(
+        self, tmp_path, store, mock_embedder
+    ):
         """Unsupported file extension propagates UnsupportedFormatError."""
         f = tmp_path / "data.xyz"
         f.write_text("content")
 
         with pytest.raises(UnsupportedFormatError):
-            run(ingest(source=f, library="default", metadata=None, store=store))
+            await ingest(source=f, library="default", metadata=None, store=store)
 
     @pytest.mark.integration
-    def test_ingest_missing_file_raises(self, tmp_path, store, mock_embedder):
+    async def test_ingest_missing_file_raises(self, tmp_path, store, mock_embedder):
         """Ingest of a non-existent file raises IngestionError."""
         missing = tmp_path / "ghost.pdf"
         with pytest.raises(IngestionError):
-            run(ingest(source=missing, library="default", metadata=None, store=store))
+            await ingest(source=missing, library="default", metadata=None, store=store)
 
     @pytest.mark.integration
-    def test_ingest_file_sets_file_type_and_last_modified(
-        self, tmp_path, store, mock_embedder, _patch_chunker, _patch_converter
+    async def test_ingest_file_sets_file_type_and_last_modified(
+        self, stub_pdf, store, mock_embedder, _patch_chunker, _patch_converter
     ):
         """Chunks store the correct file_type, a non-empty last_modified, and page=0."""
-        f = tmp_path / "report.pdf"
-        f.write_bytes(b"%PDF-1.4 minimal")
-
-        result = run(ingest(source=f, library="default", metadata=None, store=store))
+        result = await ingest(
+            source=stub_pdf, library="default", metadata=None, store=store
+        )
         chunks = store.get_document(result.doc_id)
 
         assert all(c.file_type == "pdf" for c in chunks)
@@ -110,14 +129,14 @@ class TestIngestFile:
         assert all(c.page == 0 for c in chunks)
 
     @pytest.mark.integration
-    def test_ingest_file_type_matches_extension(
+    async def test_ingest_file_type_matches_extension(
         self, tmp_path, store, mock_embedder, _patch_chunker, _patch_converter
     ):
         """file_type is derived from the file extension, lowercased."""
         f = tmp_path / "slides.DOCX"
         f.write_bytes(b"PK fake docx content")
 
-        result = run(ingest(source=f, library="default", metadata=None, store=store))
+        result = await ingest(source=f, library="default", metadata=None, store=store)
         chunks = store.get_document(result.doc_id)
 
         assert all(c.file_type == "docx" for c in chunks)
@@ -127,7 +146,9 @@ class TestIngestURL:
     """Tests for URL ingestion with mocked httpx."""
 
     @pytest.mark.integration
-    def test_ingest_url_success(self, store, mock_embedder, _patch_chunker, httpx_mock):
+    async def test_ingest_url_success(
+        self, store, mock_embedder, _patch_chunker, httpx_mock
+    ):
         """URL ingestion with a mocked 200 response returns status='indexed'."""
         httpx_mock.add_response(
             url="https://example.com/doc",
@@ -135,19 +156,17 @@ class TestIngestURL:
             status_code=200,
         )
 
-        result = run(
-            ingest(
-                source="https://example.com/doc",
-                library="web",
-                metadata=None,
-                store=store,
-            )
+        result = await ingest(
+            source="https://example.com/doc",
+            library="web",
+            metadata=None,
+            store=store,
         )
         assert result.status == "indexed"
         assert result.library == "web"
 
     @pytest.mark.integration
-    def test_ingest_url_404_raises(self, store, mock_embedder, httpx_mock):
+    async def test_ingest_url_404_raises(self, store, mock_embedder, httpx_mock):
         """A 404 response raises IngestionError."""
         httpx_mock.add_response(
             url="https://example.com/missing",
@@ -155,37 +174,31 @@ class TestIngestURL:
         )
 
         with pytest.raises(IngestionError, match="404"):
-            run(
-                ingest(
-                    source="https://example.com/missing",
-                    library="web",
-                    metadata=None,
-                    store=store,
-                )
+            await ingest(
+                source="https://example.com/missing",
+                library="web",
+                metadata=None,
+                store=store,
             )
 
     @pytest.mark.integration
-    def test_ingest_url_timeout_raises(self, store, mock_embedder, httpx_mock):
+    async def test_ingest_url_timeout_raises(self, store, mock_embedder, httpx_mock):
         """A network timeout raises IngestionError."""
-        import httpx
-
         httpx_mock.add_exception(
             httpx.ReadTimeout("timeout"),
             url="https://example.com/slow",
         )
 
         with pytest.raises(IngestionError):
-            run(
-                ingest(
-                    source="https://example.com/slow",
-                    library="web",
-                    metadata=None,
-                    store=store,
-                )
+            await ingest(
+                source="https://example.com/slow",
+                library="web",
+                metadata=None,
+                store=store,
             )
 
     @pytest.mark.integration
-    def test_ingest_url_sets_file_type_url(
+    async def test_ingest_url_sets_file_type_url(
         self, store, mock_embedder, _patch_chunker, httpx_mock
     ):
         """URL ingestion sets file_type='url' and page=0 on every chunk."""
@@ -195,13 +208,11 @@ class TestIngestURL:
             status_code=200,
         )
 
-        result = run(
-            ingest(
-                source="https://example.com/page",
-                library="web",
-                metadata=None,
-                store=store,
-            )
+        result = await ingest(
+            source="https://example.com/page",
+            library="web",
+            metadata=None,
+            store=store,
         )
         chunks = store.get_document(result.doc_id)
 
@@ -209,7 +220,7 @@ class TestIngestURL:
         assert all(c.page == 0 for c in chunks)
 
     @pytest.mark.integration
-    def test_ingest_url_uses_last_modified_header(
+    async def test_ingest_url_uses_last_modified_header(
         self, store, mock_embedder, _patch_chunker, httpx_mock
     ):
         """last_modified is populated from the HTTP Last-Modified response header."""
@@ -220,13 +231,11 @@ class TestIngestURL:
             headers={"Last-Modified": "Wed, 01 Jan 2025 00:00:00 GMT"},
         )
 
-        result = run(
-            ingest(
-                source="https://example.com/dated",
-                library="web",
-                metadata=None,
-                store=store,
-            )
+        result = await ingest(
+            source="https://example.com/dated",
+            library="web",
+            metadata=None,
+            store=store,
         )
         chunks = store.get_document(result.doc_id)
 
@@ -237,21 +246,21 @@ class TestIngestDedup:
     """Deduplication scenarios — all three cases."""
 
     @pytest.mark.integration
-    def test_dedup_same_hash_returns_skipped(
-        self, tmp_path, store, mock_embedder, _patch_chunker, _patch_converter
+    async def test_dedup_same_hash_returns_skipped(
+        self, stub_pdf, store, mock_embedder, _patch_chunker, _patch_converter
     ):
         """Scenario 1: same (source, library) + same content → status='skipped'."""
-        f = tmp_path / "doc.pdf"
-        content = b"%PDF-1.4 constant"
-        f.write_bytes(content)
-
         # First ingest
-        r1 = run(ingest(source=f, library="default", metadata=None, store=store))
+        r1 = await ingest(
+            source=stub_pdf, library="same_hash", metadata=None, store=store
+        )
         assert r1.status == "indexed"
         initial_doc_id = r1.doc_id
 
         # Second ingest — same bytes
-        r2 = run(ingest(source=f, library="default", metadata=None, store=store))
+        r2 = await ingest(
+            source=stub_pdf, library="same_hash", metadata=None, store=store
+        )
         assert r2.status == "skipped"
         assert r2.chunk_count == 0
 
@@ -259,21 +268,21 @@ class TestIngestDedup:
         assert len(store.get_document(initial_doc_id)) == 3
 
     @pytest.mark.integration
-    def test_dedup_different_hash_returns_replaced(
+    async def test_dedup_different_hash_returns_replaced(
         self, tmp_path, store, mock_embedder, _patch_chunker, _patch_converter
     ):
         """Scenario 2: same (source, library) + different content → 'replaced'."""
         f = tmp_path / "doc.pdf"
         f.write_bytes(b"%PDF-1.4 version_one")
 
-        r1 = run(ingest(source=f, library="default", metadata=None, store=store))
+        r1 = await ingest(source=f, library="diff_hash", metadata=None, store=store)
         old_doc_id = r1.doc_id
         assert r1.status == "indexed"
 
         # Overwrite file with different content
         f.write_bytes(b"%PDF-1.4 version_two_completely_different")
 
-        r2 = run(ingest(source=f, library="default", metadata=None, store=store))
+        r2 = await ingest(source=f, library="diff_hash", metadata=None, store=store)
         assert r2.status == "replaced"
         # Old chunks gone
         assert store.get_document(old_doc_id) == []
@@ -281,15 +290,12 @@ class TestIngestDedup:
         assert len(store.get_document(r2.doc_id)) == 3
 
     @pytest.mark.integration
-    def test_dedup_same_source_different_library_independent(
-        self, tmp_path, store, mock_embedder, _patch_chunker, _patch_converter
+    async def test_dedup_same_source_different_library_independent(
+        self, stub_pdf, store, mock_embedder, _patch_chunker, _patch_converter
     ):
         """Scenario 3: same source, different libraries are indexed independently."""
-        f = tmp_path / "doc.pdf"
-        f.write_bytes(b"%PDF-1.4 shared_content")
-
-        r_a = run(ingest(source=f, library="lib_a", metadata=None, store=store))
-        r_b = run(ingest(source=f, library="lib_b", metadata=None, store=store))
+        r_a = await ingest(source=stub_pdf, library="lib_a", metadata=None, store=store)
+        r_b = await ingest(source=stub_pdf, library="lib_b", metadata=None, store=store)
 
         assert r_a.status == "indexed"
         assert r_b.status == "indexed"
@@ -309,87 +315,68 @@ class TestIngestFileErrorPaths:
     """Tests for exception handling in the ingest() pipeline."""
 
     @pytest.mark.integration
-    def test_conversion_general_error_becomes_ingestion_error(
-        self, tmp_path, store, mock_embedder, monkeypatch
+    @pytest.mark.parametrize(
+        ("_failing_stage", "match"),
+        [
+            pytest.param(
+                ("mcpvectordb.ingestor.convert", RuntimeError("parse error")),
+                "Conversion failed",
+                id="convert",
+            ),
+            pytest.param(
+                ("mcpvectordb.ingestor.chunk", RuntimeError("tokenizer crash")),
+                "Chunking failed",
+                id="chunk",
+            ),
+        ],
+        indirect=["_failing_stage"],
+    )
+    async def test_stage_error_becomes_ingestion_error(
+        self, stub_pdf, store, mock_embedder, _failing_stage, match
     ):
-        """A RuntimeError from convert() is wrapped in IngestionError (lines 108-109)."""
-        f = tmp_path / "doc.pdf"
-        f.write_bytes(b"%PDF content")
-
-        def _bad_convert(_path):
-            raise RuntimeError("parse error")
-
-        monkeypatch.setattr("mcpvectordb.ingestor.convert", _bad_convert)
-
-        with pytest.raises(IngestionError, match="Conversion failed"):
-            run(ingest(source=f, library="default", metadata=None, store=store))
+        """A RuntimeError from convert() or chunk() is wrapped in IngestionError."""
+        with pytest.raises(IngestionError, match=match):
+            await ingest(source=stub_pdf, library="default", metadata=None, store=store)
 
     @pytest.mark.integration
-    def test_chunker_error_becomes_ingestion_error(
-        self, tmp_path, store, mock_embedder, _patch_converter, monkeypatch
-    ):
-        """A RuntimeError from chunk() is wrapped in IngestionError (lines 116-117)."""
-        f = tmp_path / "doc.pdf"
-        f.write_bytes(b"%PDF content")
-
-        def _bad_chunk(_text):
-            raise RuntimeError("tokenizer crash")
-
-        monkeypatch.setattr("mcpvectordb.ingestor.chunk", _bad_chunk)
-
-        with pytest.raises(IngestionError, match="Chunking failed"):
-            run(ingest(source=f, library="default", metadata=None, store=store))
-
-    @pytest.mark.integration
-    def test_empty_chunks_raises_ingestion_error(
-        self, tmp_path, store, mock_embedder, _patch_converter, monkeypatch
+    async def test_empty_chunks_raises_ingestion_error(
+        self, stub_pdf, store, mock_embedder, _patch_converter, monkeypatch
     ):
         """Empty chunk list raises IngestionError (line 120)."""
-        f = tmp_path / "doc.pdf"
-        f.write_bytes(b"%PDF content")
-
         monkeypatch.setattr("mcpvectordb.ingestor.chunk", lambda _text: [])
 
         with pytest.raises(IngestionError, match="No usable chunks"):
-            run(ingest(source=f, library="default", metadata=None, store=store))
+            await ingest(source=stub_pdf, library="default", metadata=None, store=store)
 
     @pytest.mark.integration
-    def test_embedding_error_becomes_ingestion_error(
-        self, tmp_path, store, _patch_converter, _patch_chunker, monkeypatch
+    async def test_embedding_error_becomes_ingestion_error(
+        self, stub_pdf, store, _patch_converter, _patch_chunker, monkeypatch
     ):
         """An exception from embed_documents() is wrapped in IngestionError (lines 125-126)."""
-        from unittest.mock import MagicMock
-
-        f = tmp_path / "doc.pdf"
-        f.write_bytes(b"%PDF content")
-
         bad_embedder = MagicMock()
         bad_embedder.embed_documents.side_effect = RuntimeError("OOM")
         monkeypatch.setattr("mcpvectordb.embedder._instance", bad_embedder)
 
         with pytest.raises(IngestionError, match="Embedding failed"):
-            run(ingest(source=f, library="default", metadata=None, store=store))
+            await ingest(source=stub_pdf, library="default", metadata=None, store=store)
 
     @pytest.mark.unit
-    def test_store_write_error_becomes_ingestion_error(
-        self, tmp_path, _patch_converter, _patch_chunker, monkeypatch
+    async def test_store_write_error_becomes_ingestion_error(
+        self, stub_pdf, _patch_converter, _patch_chunker, monkeypatch
     ):
         """A RuntimeError from store.upsert_chunks() is wrapped in IngestionError (lines 151-152)."""
-        from unittest.mock import MagicMock
-
-        f = tmp_path / "doc.pdf"
-        f.write_bytes(b"%PDF content")
-
         bad_store = MagicMock()
         bad_store.find_existing.return_value = (None, None)
         bad_store.upsert_chunks.side_effect = RuntimeError("disk full")
 
         mock_emb = MagicMock()
-        mock_emb.embed_documents.return_value = np.zeros((3, 768), dtype=np.float32)
+        mock_emb.embed_documents.return_value = _ZERO_EMBEDDINGS
         monkeypatch.setattr("mcpvectordb.embedder._instance", mock_emb)
 
         with pytest.raises(IngestionError, match="Store write failed"):
-            run(ingest(source=f, library="default", metadata=None, store=bad_store))
+            await ingest(
+                source=stub_pdf, library="default", metadata=None, store=bad_store
+            )
 
 
 class TestIngestHelpers:
@@ -398,16 +385,12 @@ class TestIngestHelpers:
     @pytest.mark.unit
     def test_extract_title_returns_first_heading(self):
         """_extract_title returns the first H1 heading content from Markdown."""
-        from mcpvectordb.ingestor import _extract_title
-
         result = _extract_title("# My Document Title\n\nSome content.", "file.pdf")
         assert result == "My Document Title"
 
     @pytest.mark.unit
     def test_extract_title_falls_back_to_source_filename(self):
         """_extract_title returns the last path component when no heading is found (line 250)."""
-        from mcpvectordb.ingestor import _extract_title
-
         result = _extract_title(
             "No heading here, just plain text.",
             "https://example.com/docs/guide.html",
@@ -415,17 +398,10 @@ class TestIngestHelpers:
         assert result == "guide.html"
 
     @pytest.mark.integration
-    def test_convert_html_bytes_raises_ingestion_error_on_markitdown_failure(
+    async def test_convert_html_bytes_raises_ingestion_error_on_markitdown_failure(
         self, monkeypatch
     ):
         """IngestionError is raised when MarkItDown fails in _convert_html_bytes (lines 231-232)."""
-        from unittest.mock import MagicMock
-
-        import markitdown
-
-        from mcpvectordb.exceptions import IngestionError
-        from mcpvectordb.ingestor import _convert_html_bytes
-
         monkeypatch.setattr(
             markitdown,
             "MarkItDown",
@@ -433,7 +409,9 @@ class TestIngestHelpers:
         )
 
         with pytest.raises(IngestionError, match="HTML conversion failed"):
-            run(_convert_html_bytes(b"<html><body>test</body></html>", "https://example.com"))
+            await _convert_html_bytes(
+                b"<html><body>test</body></html>", "https://example.com"
+            )
 
 
 class TestIngestFolder:
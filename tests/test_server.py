@@ -1,151 +1,164 @@
 """Tests for server.py — MCP tool handler contracts, validation, error responses."""
 
-import asyncio
+import json
+import logging
+import os
 import sys
-from unittest.mock import MagicMock
+import uuid
+from datetime import UTC, datetime
+from pathlib import Path
+from types import SimpleNamespace
+from typing import Any
 
 import numpy as np
 import pytest
+from starlette.applications import Starlette
+from starlette.authentication import SimpleUser
+from starlette.requests import Request as StarletteRequest
+from starlette.responses import PlainTextResponse
+from starlette.routing import Route
 from starlette.testclient import TestClient
+from starlette.types import Receive, Scope, Send
 
+from mcpvectordb import server
 from mcpvectordb.config import settings
+from mcpvectordb.exceptions import IngestionError, StoreError, UnsupportedFormatError
+from mcpvectordb.ingestor import BulkIngestResult, IngestResult
+from mcpvectordb.server import _RequireGoogleAuth, _validate_oauth_config
+from mcpvectordb.store import ChunkRecord
 
+# Keep the module on one worker under `--dist loadgroup` so the module/session
+# _sse_app and _upload_app clients are built once rather than once per worker
+pytestmark = pytest.mark.xdist_group("server")
 
-def run(coro):
-    """Run a coroutine synchronously in tests."""
-    return asyncio.get_event_loop().run_until_complete(coro)
+# Query vector for tests whose mocked store ignores it; never mutated
+_DUMMY_EMBED = np.zeros(settings.embedding_dimension, dtype=np.float32)
 
+# Query embedder stub; search only ever calls embed_query()
+_FAKE_EMBEDDER = SimpleNamespace(embed_query=lambda _query: _DUMMY_EMBED)
 
-@pytest.fixture(autouse=True)
-def _use_tmp_store(tmp_path, monkeypatch):
-    """Point server._store at a tmp LanceDB directory for each test."""
-    from mcpvectordb.store import Store
+# Stored chunk vector, built once and shared by every record that needs one
+_CHUNK_EMBEDDING = [0.1] * settings.embedding_dimension
 
-    store = Store(uri=str(tmp_path / "lancedb"), table_name="test_documents")
-    monkeypatch.setattr("mcpvectordb.server._store", store)
-    return store
+# Template for _fake_ingest; each call copies it with the caller's source/library
+_FAKE_RESULT = IngestResult(
+    status="indexed",
+    doc_id="doc-uuid-1234",
+    source="",
+    library="default",
+    chunk_count=3,
+)
 
 
-@pytest.fixture(autouse=True)
-def _mock_ingest(monkeypatch):
-    """Patch ingestor.ingest so tool tests don't run the real pipeline."""
-    from mcpvectordb.ingestor import IngestResult
-
-    async def _fake_ingest(source, library, metadata, store):
-        return IngestResult(
-            status="indexed",
-            doc_id="doc-uuid-1234",
-            source=str(source),
-            library=library,
-            chunk_count=3,
-        )
+async def _fake_ingest(source, library, metadata, store):
+    """Stand-in for ingestor.ingest that reports a fresh 3-chunk index."""
+    return _FAKE_RESULT.model_copy(update={"source": str(source), "library": library})
 
-    monkeypatch.setattr("mcpvectordb.server.ingest", _fake_ingest)
 
+async def _fake_ingest_content(content, source, library, metadata, store):
+    """Stand-in for ingestor.ingest_content with the same canned result."""
+    return _FAKE_RESULT.model_copy(update={"source": source, "library": library})
 
-class TestIngestFileTool:
-    """Tests for the ingest_file MCP tool handler."""
 
-    @pytest.mark.unit
-    def test_ingest_file_returns_status(self, tmp_path):
-        """ingest_file returns a dict with status and doc_id on success."""
-        from mcpvectordb import server
+def _raising_async(exc: BaseException):
+    """Return an async stand-in for a pipeline function that always raises exc."""
 
-        f = tmp_path / "doc.pdf"
-        f.write_bytes(b"content")
-        result = run(server.ingest_file(path=str(f)))
+    async def _raise(*args, **kwargs):
+        raise exc
 
-        assert result["status"] == "indexed"
-        assert "doc_id" in result
+    return _raise
 
-    @pytest.mark.unit
-    def test_ingest_file_with_metadata(self, tmp_path):
-        """ingest_file accepts metadata dict and returns success."""
-        from mcpvectordb import server
 
-        f = tmp_path / "doc.pdf"
-        f.write_bytes(b"content")
-        result = run(
-            server.ingest_file(path=str(f), library="mylib", metadata={"k": "v"})
-        )
+@pytest.fixture(autouse=True)
+def _use_tmp_store(request, monkeypatch):
+    """Point server._store at the shared tmp store from conftest.
+
+    Tests marked ``no_store`` install their own ``_store`` mock and skip this.
+    The store is resolved lazily, so a run of only ``no_store`` tests never
+    creates the tmp LanceDB directory; conftest's ``store`` empties it after
+    each test.
+    """
+    if request.node.get_closest_marker("no_store"):
+        yield None
+        return
+    store = request.getfixturevalue("store")
+    monkeypatch.setattr(server, "_store", store)
+    yield store
 
-        assert result["status"] == "indexed"
 
-    @pytest.mark.unit
-    def test_ingest_file_unsupported_format_returns_error(self, tmp_path, monkeypatch):
-        """ingest_file with unsupported format returns an error dict, never raises."""
-        from mcpvectordb import server
-        from mcpvectordb.exceptions import UnsupportedFormatError
+@pytest.fixture(autouse=True)
+def _mock_ingest(request, monkeypatch):
+    """Patch ingestor.ingest so tool tests don't run the real pipeline.
 
-        async def _raise(*args, **kwargs):
-            raise UnsupportedFormatError(".xyz not supported")
+    Skipped for tests marked ``no_ingest``, which never reach ingest().
+    """
+    if request.node.get_closest_marker("no_ingest"):
+        return
+    monkeypatch.setattr(server, "ingest", _fake_ingest)
 
-        monkeypatch.setattr("mcpvectordb.server.ingest", _raise)
 
-        f = tmp_path / "data.xyz"
-        f.write_text("content")
-        result = run(server.ingest_file(path=str(f)))
+@pytest.fixture
+def _patch_embedder(monkeypatch):
+    """Patch server.get_embedder so search never loads the real model."""
+    monkeypatch.setattr(server, "get_embedder", lambda: _FAKE_EMBEDDER)
+    return _FAKE_EMBEDDER
 
-        assert result["status"] == "error"
-        assert "error" in result
 
-    @pytest.mark.unit
-    def test_ingest_file_ingestion_error_returns_error_dict(self, tmp_path, monkeypatch):
-        """IngestionError from the pipeline returns a structured error dict (lines 64-65)."""
-        from mcpvectordb import server
-        from mcpvectordb.exceptions import IngestionError
+@pytest.fixture(scope="session")
+def _sample_xyz(tmp_path_factory):
+    """File with an unsupported extension, written once per session."""
+    path = tmp_path_factory.mktemp("samples") / "data.xyz"
+    path.write_text("content")
+    return path
 
-        async def _raise(*args, **kwargs):
-            raise IngestionError("pipeline failed")
 
-        monkeypatch.setattr("mcpvectordb.server.ingest", _raise)
+class TestIngestFileTool:
+    """Tests for the ingest_file MCP tool handler."""
 
-        f = tmp_path / "doc.pdf"
-        f.write_bytes(b"content")
-        result = run(server.ingest_file(path=str(f)))
+    @pytest.mark.unit
+    async def test_ingest_file_returns_status(self, stub_pdf):
+        """ingest_file returns a dict with status and doc_id on success."""
+        result = await server.ingest_file(path=str(stub_pdf))
 
-        assert result["status"] == "error"
-        assert "Ingestion failed" in result["error"]
+        assert result["status"] == "indexed"
+        assert "doc_id" in result
 
     @pytest.mark.unit
-    def test_ingest_file_unexpected_exception_returns_error_dict(self, tmp_path, monkeypatch):
-        """Unexpected exception returns a structured error dict (lines 66-68)."""
-        from mcpvectordb import server
+    async def test_ingest_file_with_metadata(self, stub_pdf):
+        """ingest_file accepts metadata dict and returns success."""
+        result = await server.ingest_file(
+            path=str(stub_pdf), library="mylib", metadata={"k": "v"}
+        )
 
-        async def _raise(*args, **kwargs):
-            raise RuntimeError("unexpected crash")
+        assert result["status"] == "indexed"
 
-        monkeypatch.setattr("mcpvectordb.server.ingest", _raise)
+    @pytest.mark.unit
+    async def test_ingest_file_unsupported_format_returns_error(
+        self, _sample_xyz, monkeypatch
+    ):
+        """ingest_file with unsupported format returns an error dict, never raises."""
+        monkeypatch.setattr(
+            server,
+            "ingest",
+            _raising_async(UnsupportedFormatError(".xyz not supported")),
+        )
 
-        f = tmp_path / "doc.pdf"
-        f.write_bytes(b"content")
-        result = run(server.ingest_file(path=str(f)))
+        result = await server.ingest_file(path=str(_sample_xyz))
 
         assert result["status"] == "error"
-        assert "Internal error" in result["error"]
+        assert "error" in result
 
     @pytest.mark.unit
-    def test_ingest_file_tilde_path_is_expanded(self, monkeypatch):
+    async def test_ingest_file_tilde_path_is_expanded(self, monkeypatch):
         """ingest_file with a ~/... path calls ingest with an expanded absolute path."""
-        from pathlib import Path
-
-        from mcpvectordb import server
-        from mcpvectordb.ingestor import IngestResult
-
         captured: dict = {}
 
         async def _spy(source, library, metadata, store):
             captured["source"] = source
-            return IngestResult(
-                status="indexed",
-                doc_id="tilde-doc",
-                source=str(source),
-                library=library,
-                chunk_count=1,
-            )
+            return await _fake_ingest(source, library, metadata, store)
 
-        monkeypatch.setattr("mcpvectordb.server.ingest", _spy)
-        run(server.ingest_file(path="~/docs/report.pdf"))
+        monkeypatch.setattr(server, "ingest", _spy)
+        await server.ingest_file(path="~/docs/report.pdf")
 
         source = captured["source"]
         assert isinstance(source, Path)
@@ -158,61 +171,18 @@ class TestIngestUrlTool:
     """Tests for the ingest_url MCP tool handler."""
 
     @pytest.mark.unit
-    def test_ingest_url_returns_status(self):
+    async def test_ingest_url_returns_status(self):
         """ingest_url with valid URL returns status dict."""
-        from mcpvectordb import server
-
-        result = run(server.ingest_url(url="https://example.com/page"))
+        result = await server.ingest_url(url="https://example.com/page")
         assert result["status"] == "indexed"
 
-    @pytest.mark.unit
-    def test_ingest_url_rejects_non_http(self):
-        """ingest_url rejects URLs that don't start with http:// or https://."""
-        from mcpvectordb import server
-
-        result = run(server.ingest_url(url="ftp://example.com/file"))
-        assert result["status"] == "error"
-        assert "error" in result
-
-    @pytest.mark.unit
-    def test_ingest_url_ingestion_error_returns_error(self, monkeypatch):
-        """IngestionError from the pipeline becomes an error dict response."""
-        from mcpvectordb import server
-        from mcpvectordb.exceptions import IngestionError
-
-        async def _raise(*args, **kwargs):
-            raise IngestionError("network timeout")
-
-        monkeypatch.setattr("mcpvectordb.server.ingest", _raise)
-        result = run(server.ingest_url(url="https://example.com/page"))
-
-        assert result["status"] == "error"
-        assert "network timeout" in result["error"]
-
-    @pytest.mark.unit
-    def test_ingest_url_unexpected_exception_returns_error_dict(self, monkeypatch):
-        """Unexpected exception in ingest_url returns a structured error dict (lines 103-105)."""
-        from mcpvectordb import server
-
-        async def _raise(*args, **kwargs):
-            raise RuntimeError("unexpected")
-
-        monkeypatch.setattr("mcpvectordb.server.ingest", _raise)
-        result = run(server.ingest_url(url="https://example.com"))
-
-        assert result["status"] == "error"
-        assert "Internal error" in result["error"]
-
 
 class TestIngestContentTool:
     """Tests for the ingest_content MCP tool handler."""
 
     @pytest.mark.unit
-    def test_returns_indexed_on_new_content(self, monkeypatch):
+    async def test_returns_indexed_on_new_content(self, monkeypatch):
         """ingest_content returns status='indexed' with doc_id and chunk_count on new content."""
-        from mcpvectordb import server
-        from mcpvectordb.ingestor import IngestResult
-
         async def _fake(content, source, library, metadata, store):
             return IngestResult(
                 status="indexed",
@@ -222,19 +192,16 @@ class TestIngestContentTool:
                 chunk_count=3,
             )
 
-        monkeypatch.setattr("mcpvectordb.server._ingest_content", _fake)
-        result = run(server.ingest_content(content="Hello world", source="test.txt"))
+        monkeypatch.setattr(server, "_ingest_content", _fake)
+        result = await server.ingest_content(content="Hello world", source="test.txt")
 
         assert result["status"] == "indexed"
         assert result["doc_id"] == "content-doc-id"
         assert result["chunk_count"] == 3
 
     @pytest.mark.unit
-    def test_returns_skipped_for_duplicate(self, monkeypatch):
+    async def test_returns_skipped_for_duplicate(self, monkeypatch):
         """ingest_content returns status='skipped' and chunk_count=0 for duplicate content."""
-        from mcpvectordb import server
-        from mcpvectordb.ingestor import IngestResult
-
         async def _fake(content, source, library, metadata, store):
             return IngestResult(
                 status="skipped",
@@ -244,18 +211,15 @@ class TestIngestContentTool:
                 chunk_count=0,
             )
 
-        monkeypatch.setattr("mcpvectordb.server._ingest_content", _fake)
-        result = run(server.ingest_content(content="Hello world", source="test.txt"))
+        monkeypatch.setattr(server, "_ingest_content", _fake)
+        result = await server.ingest_content(content="Hello world", source="test.txt")
 
         assert result["status"] == "skipped"
         assert result["chunk_count"] == 0
 
     @pytest.mark.unit
-    def test_returns_replaced_for_updated_content(self, monkeypatch):
+    async def test_returns_replaced_for_updated_content(self, monkeypatch):
         """ingest_content returns status='replaced' when content hash has changed."""
-        from mcpvectordb import server
-        from mcpvectordb.ingestor import IngestResult
-
         async def _fake(content, source, library, metadata, store):
             return IngestResult(
                 status="replaced",
@@ -265,339 +229,181 @@ class TestIngestContentTool:
                 chunk_count=2,
             )
 
-        monkeypatch.setattr("mcpvectordb.server._ingest_content", _fake)
-        result = run(server.ingest_content(content="Updated content", source="test.txt"))
+        monkeypatch.setattr(server, "_ingest_content", _fake)
+        result = await server.ingest_content(
+            content="Updated content", source="test.txt"
+        )
 
         assert result["status"] == "replaced"
         assert "doc_id" in result
 
     @pytest.mark.unit
-    def test_empty_content_returns_error(self):
+    async def test_empty_content_returns_error(self):
         """Empty or whitespace-only content returns an error dict without calling _ingest_content."""
-        from mcpvectordb import server
-
-        result_empty = run(server.ingest_content(content="", source="test.txt"))
+        result_empty = await server.ingest_content(content="", source="test.txt")
         assert result_empty["status"] == "error"
         assert "error" in result_empty
 
-        result_whitespace = run(server.ingest_content(content="   ", source="test.txt"))
+        result_whitespace = await server.ingest_content(
+            content="   ", source="test.txt"
+        )
         assert result_whitespace["status"] == "error"
         assert "error" in result_whitespace
 
     @pytest.mark.unit
-    def test_ingestion_error_returns_error_dict(self, monkeypatch):
-        """IngestionError from _ingest_content returns a structured error dict."""
-        from mcpvectordb import server
-        from mcpvectordb.exceptions import IngestionError
-
-        async def _raise(*args, **kwargs):
-            raise IngestionError("pipeline failed")
-
-        monkeypatch.setattr("mcpvectordb.server._ingest_content", _raise)
-        result = run(server.ingest_content(content="Hello world", source="test.txt"))
-
-        assert result["status"] == "error"
-        assert "Ingestion failed" in result["error"]
-
-    @pytest.mark.unit
-    def test_unexpected_exception_returns_error_dict(self, monkeypatch):
-        """Unexpected exception from _ingest_content returns a structured error dict."""
-        from mcpvectordb import server
-
-        async def _raise(*args, **kwargs):
-            raise RuntimeError("unexpected crash")
-
-        monkeypatch.setattr("mcpvectordb.server._ingest_content", _raise)
-        result = run(server.ingest_content(content="Hello world", source="test.txt"))
-
-        assert result["status"] == "error"
-        assert "Internal error" in result["error"]
-
-    @pytest.mark.unit
-    def test_library_and_metadata_forwarded(self, monkeypatch):
+    async def test_library_and_metadata_forwarded(self, monkeypatch):
         """ingest_content forwards library and metadata arguments to _ingest_content."""
-        from mcpvectordb import server
-        from mcpvectordb.ingestor import IngestResult
-
         captured: dict = {}
 
         async def _spy(content, source, library, metadata, store):
             captured["library"] = library
             captured["metadata"] = metadata
-            return IngestResult(
-                status="indexed",
-                doc_id="spy-doc-id",
-                source=source,
-                library=library,
-                chunk_count=1,
-            )
-
-        monkeypatch.setattr("mcpvectordb.server._ingest_content", _spy)
-        run(
-            server.ingest_content(
-                content="Hello world",
-                source="test.txt",
-                library="mylib",
-                metadata={"author": "tester"},
-            )
+            return await _fake_ingest_content(content, source, library, metadata, store)
+
+        monkeypatch.setattr(server, "_ingest_content", _spy)
+        await server.ingest_content(
+            content="Hello world",
+            source="test.txt",
+            library="mylib",
+            metadata={"author": "tester"},
         )
 
         assert captured["library"] == "mylib"
         assert captured["metadata"] == {"author": "tester"}
 
 
-class TestSearchTool:
-    """Tests for the search MCP tool handler."""
+# Each call gets the test's stub file path; only ingest_file reads it
+_INGEST_ERROR_TOOLS = [
+    pytest.param(
+        "ingest",
+        lambda path: server.ingest_file(path=str(path)),
+        id="ingest_file",
+    ),
+    pytest.param(
+        "ingest",
+        lambda _path: server.ingest_url(url="https://example.com/page"),
+        id="ingest_url",
+    ),
+    pytest.param(
+        "_ingest_content",
+        lambda _path: server.ingest_content(content="Hello world", source="test.txt"),
+        id="ingest_content",
+    ),
+]
+
+_INGEST_ERROR_EXCEPTIONS = [
+    pytest.param(IngestionError("pipeline failed"), "Ingestion failed", id="ingestion"),
+    pytest.param(RuntimeError("unexpected crash"), "Internal error", id="unexpected"),
+]
+
+
+@pytest.mark.no_store
+class TestIngestErrorResponses:
+    """Pipeline exceptions in every ingest tool become structured error dicts."""
+
+    @pytest.mark.unit
+    @pytest.mark.parametrize(("target", "call"), _INGEST_ERROR_TOOLS)
+    @pytest.mark.parametrize(("exc", "expected_substr"), _INGEST_ERROR_EXCEPTIONS)
+    async def test_pipeline_error_returns_error_dict(
+        self, stub_pdf, monkeypatch, target, call, exc, expected_substr
+    ):
+        """IngestionError and unexpected exceptions are reported, never raised."""
+        monkeypatch.setattr(server, target, _raising_async(exc))
+        result = await call(stub_pdf)
 
-    @pytest.mark.unit
-    def test_search_empty_query_returns_error(self, monkeypatch):
-        """Empty query string returns an error response."""
-        from mcpvectordb import server
-
-        result = run(server.search(query="   "))
         assert result["status"] == "error"
+        assert expected_substr in result["error"]
+        assert str(exc) in result["error"]
 
-    @pytest.mark.unit
-    def test_search_top_k_out_of_range(self):
-        """top_k=0 or top_k>100 returns error."""
-        from mcpvectordb import server
 
-        assert run(server.search(query="test", top_k=0))["status"] == "error"
-        assert run(server.search(query="test", top_k=101))["status"] == "error"
+class TestSearchTool:
+    """Tests for the search MCP tool handler."""
 
     @pytest.mark.unit
-    def test_search_returns_results_key(self, monkeypatch):
+    @pytest.mark.no_store
+    async def test_search_returns_results_key(self, monkeypatch, _patch_embedder):
         """Successful search returns dict with 'results' list."""
-        from mcpvectordb import server
-
         # Patch store.search to return empty list (no real data needed)
-        monkeypatch.setattr(
-            "mcpvectordb.server._store",
-            MagicMock(
-                **{
-                    "search.return_value": [],
-                }
-            ),
-        )
-        # Patch get_embedder to return a mock
-        mock_emb = MagicMock()
-        mock_emb.embed_query.return_value = np.random.rand(settings.embedding_dimension).astype(np.float32)
-        monkeypatch.setattr("mcpvectordb.server.get_embedder", lambda: mock_emb)
+        monkeypatch.setattr(server, "_store", SimpleNamespace(search=lambda **_k: []))
 
-        result = run(server.search(query="machine learning", top_k=5))
+        result = await server.search(query="machine learning", top_k=5)
         assert "results" in result
         assert isinstance(result["results"], list)
 
-    @pytest.mark.unit
-    def test_search_store_error_returns_error(self, monkeypatch):
-        """StoreError from the store returns a structured error dict (lines 157-158)."""
-        from mcpvectordb import server
-        from mcpvectordb.exceptions import StoreError
-
-        bad_store = MagicMock()
-        bad_store.search.side_effect = StoreError("db failure")
-        monkeypatch.setattr("mcpvectordb.server._store", bad_store)
-
-        mock_emb = MagicMock()
-        mock_emb.embed_query.return_value = np.random.rand(settings.embedding_dimension).astype(np.float32)
-        monkeypatch.setattr("mcpvectordb.server.get_embedder", lambda: mock_emb)
-
-        result = run(server.search(query="test query"))
-        assert result["status"] == "error"
-        assert "Search failed" in result["error"]
-
-    @pytest.mark.unit
-    def test_search_unexpected_exception_returns_error(self, monkeypatch):
-        """Unexpected exception in search returns a structured error dict (lines 159-161)."""
-        from mcpvectordb import server
-
-        bad_store = MagicMock()
-        bad_store.search.side_effect = RuntimeError("unexpected")
-        monkeypatch.setattr("mcpvectordb.server._store", bad_store)
-
-        mock_emb = MagicMock()
-        mock_emb.embed_query.return_value = np.random.rand(settings.embedding_dimension).astype(np.float32)
-        monkeypatch.setattr("mcpvectordb.server.get_embedder", lambda: mock_emb)
-
-        result = run(server.search(query="test query"))
-        assert result["status"] == "error"
-        assert "Internal error" in result["error"]
-
-
-class TestListDocumentsTool:
-    """Tests for the list_documents MCP tool handler."""
-
-    @pytest.mark.unit
-    def test_list_documents_invalid_limit(self):
-        """limit=0 returns error."""
-        from mcpvectordb import server
 
-        result = run(server.list_documents(limit=0))
+# Tool calls whose arguments fail validation before any store or ingest access
+_INVALID_ARGUMENT_CALLS = [
+    pytest.param(lambda: server.search(query="   "), id="search-blank-query"),
+    pytest.param(lambda: server.search(query="test", top_k=0), id="search-top_k-0"),
+    pytest.param(lambda: server.search(query="test", top_k=101), id="search-top_k-101"),
+    pytest.param(lambda: server.list_documents(limit=0), id="list_documents-limit-0"),
+    pytest.param(
+        lambda: server.list_documents(offset=-1), id="list_documents-negative-offset"
+    ),
+    pytest.param(lambda: server.delete_document(doc_id=""), id="delete_document-empty"),
+    pytest.param(lambda: server.get_document(doc_id=""), id="get_document-empty"),
+    pytest.param(
+        lambda: server.ingest_url(url="ftp://example.com/file"), id="ingest_url-ftp"
+    ),
+]
+
+
+@pytest.mark.no_store
+@pytest.mark.no_ingest
+class TestArgumentValidation:
+    """Invalid tool arguments are rejected with an error dict, never raised."""
+
+    @pytest.mark.unit
+    @pytest.mark.parametrize("call", _INVALID_ARGUMENT_CALLS)
+    async def test_invalid_arguments_return_error(self, call):
+        """The tool returns status='error' without touching the store."""
+        result = await call()
         assert result["status"] == "error"
+        assert "error" in result
 
-    @pytest.mark.unit
-    def test_list_documents_negative_offset(self):
-        """Negative offset returns error."""
-        from mcpvectordb import server
-
-        result = run(server.list_documents(offset=-1))
-        assert result["status"] == "error"
-
-    @pytest.mark.unit
-    def test_list_documents_returns_documents_key(self):
-        """Successful call returns dict with 'documents' list."""
-        from mcpvectordb import server
-
-        result = run(server.list_documents())
-        assert "documents" in result
-        assert isinstance(result["documents"], list)
-
-    @pytest.mark.unit
-    def test_list_documents_store_error_returns_error(self, monkeypatch):
-        """StoreError from list_documents returns a structured error dict (lines 188-189)."""
-        from mcpvectordb import server
-        from mcpvectordb.exceptions import StoreError
-
-        bad_store = MagicMock()
-        bad_store.list_documents.side_effect = StoreError("db failure")
-        monkeypatch.setattr("mcpvectordb.server._store", bad_store)
-
-        result = run(server.list_documents())
-        assert result["status"] == "error"
-        assert "list_documents failed" in result["error"]
-
-    @pytest.mark.unit
-    def test_list_documents_unexpected_exception_returns_error(self, monkeypatch):
-        """Unexpected exception in list_documents returns a structured error dict (lines 190-192)."""
-        from mcpvectordb import server
-
-        bad_store = MagicMock()
-        bad_store.list_documents.side_effect = RuntimeError("unexpected")
-        monkeypatch.setattr("mcpvectordb.server._store", bad_store)
-
-        result = run(server.list_documents())
-        assert result["status"] == "error"
-        assert "Internal error" in result["error"]
-
-
-class TestListLibrariesTool:
-    """Tests for the list_libraries MCP tool handler."""
-
-    @pytest.mark.unit
-    def test_list_libraries_returns_libraries_key(self):
-        """list_libraries returns dict with 'libraries' list."""
-        from mcpvectordb import server
-
-        result = run(server.list_libraries())
-        assert "libraries" in result
-        assert isinstance(result["libraries"], list)
 
-    @pytest.mark.unit
-    def test_list_libraries_store_error_returns_error(self, monkeypatch):
-        """StoreError from list_libraries returns a structured error dict (lines 206-207)."""
-        from mcpvectordb import server
-        from mcpvectordb.exceptions import StoreError
+# (tool call with default arguments, key holding the returned list)
+_LIST_TOOL_CASES = [
+    pytest.param(lambda: server.list_documents(), "documents", id="list_documents"),
+    pytest.param(lambda: server.list_libraries(), "libraries", id="list_libraries"),
+]
 
-        bad_store = MagicMock()
-        bad_store.list_libraries.side_effect = StoreError("db failure")
-        monkeypatch.setattr("mcpvectordb.server._store", bad_store)
 
-        result = run(server.list_libraries())
-        assert result["status"] == "error"
-        assert "list_libraries failed" in result["error"]
+class TestListToolResponses:
+    """Success-path response shape for the list_* MCP tool handlers."""
 
     @pytest.mark.unit
-    def test_list_libraries_unexpected_exception_returns_error(self, monkeypatch):
-        """Unexpected exception in list_libraries returns a structured error dict (lines 208-210)."""
-        from mcpvectordb import server
-
-        bad_store = MagicMock()
-        bad_store.list_libraries.side_effect = RuntimeError("unexpected")
-        monkeypatch.setattr("mcpvectordb.server._store", bad_store)
-
-        result = run(server.list_libraries())
-        assert result["status"] == "error"
-        assert "Internal error" in result["error"]
+    @pytest.mark.parametrize(("call", "key"), _LIST_TOOL_CASES)
+    async def test_returns_list_under_key(self, call, key):
+        """A successful call returns a dict with a list under the tool's key."""
+        result = await call()
+        assert isinstance(result[key], list)
 
 
 class TestDeleteDocumentTool:
     """Tests for the delete_document MCP tool handler."""
 
     @pytest.mark.unit
-    def test_delete_empty_doc_id_returns_error(self):
-        """Empty doc_id string returns error."""
-        from mcpvectordb import server
-
-        result = run(server.delete_document(doc_id=""))
-        assert result["status"] == "error"
-
-    @pytest.mark.unit
-    def test_delete_nonexistent_doc_returns_deleted(self):
+    async def test_delete_nonexistent_doc_returns_deleted(self):
         """Deleting a non-existent doc_id returns status='deleted' with 0 chunks."""
-        from mcpvectordb import server
-
-        result = run(server.delete_document(doc_id="does-not-exist"))
+        result = await server.delete_document(doc_id="does-not-exist")
         assert result["status"] == "deleted"
         assert result["deleted_chunks"] == 0
 
-    @pytest.mark.unit
-    def test_delete_document_store_error_returns_error(self, monkeypatch):
-        """StoreError from delete_document returns a structured error dict (lines 229-230)."""
-        from mcpvectordb import server
-        from mcpvectordb.exceptions import StoreError
-
-        bad_store = MagicMock()
-        bad_store.delete_document.side_effect = StoreError("db failure")
-        monkeypatch.setattr("mcpvectordb.server._store", bad_store)
-
-        result = run(server.delete_document(doc_id="valid-id"))
-        assert result["status"] == "error"
-        assert "delete_document failed" in result["error"]
-
-    @pytest.mark.unit
-    def test_delete_document_unexpected_exception_returns_error(self, monkeypatch):
-        """Unexpected exception in delete_document returns a structured error dict (lines 231-233)."""
-        from mcpvectordb import server
-
-        bad_store = MagicMock()
-        bad_store.delete_document.side_effect = RuntimeError("unexpected")
-        monkeypatch.setattr("mcpvectordb.server._store", bad_store)
-
-        result = run(server.delete_document(doc_id="valid-id"))
-        assert result["status"] == "error"
-        assert "Internal error" in result["error"]
-
 
 class TestGetDocumentTool:
     """Tests for the get_document MCP tool handler."""
 
     @pytest.mark.unit
-    def test_get_document_empty_id_returns_error(self):
-        """Empty doc_id returns error."""
-        from mcpvectordb import server
-
-        result = run(server.get_document(doc_id=""))
-        assert result["status"] == "error"
-
-    @pytest.mark.unit
-    def test_get_document_missing_returns_error(self):
+    async def test_get_document_missing_returns_error(self):
         """get_document for unknown doc_id returns error dict."""
-        from mcpvectordb import server
-
-        result = run(server.get_document(doc_id="not-a-real-uuid"))
+        result = await server.get_document(doc_id="not-a-real-uuid")
         assert result["status"] == "error"
         assert "not found" in result["error"].lower() or "error" in result
 
     @pytest.mark.integration
-    def test_get_document_returns_full_content(self, _use_tmp_store):
+    async def test_get_document_returns_full_content(self, _use_tmp_store):
         """get_document returns content and metadata for an existing document (lines 255-265)."""
-        import json
-        import uuid
-        from datetime import UTC, datetime
-
-        from mcpvectordb import server
-        from mcpvectordb.store import ChunkRecord
-
         store = _use_tmp_store
         doc_id = str(uuid.uuid4())
         record = ChunkRecord(
@@ -608,7 +414,7 @@ class TestGetDocumentTool:
             content_hash="testhash",
             title="Test Document",
             content="Hello World chunk content.",
-            embedding=[0.1] * settings.embedding_dimension,
+            embedding=_CHUNK_EMBEDDING,
             chunk_index=0,
             created_at=datetime.now(UTC).isoformat(),
             metadata=json.dumps({"author": "Test"}),
@@ -618,50 +424,101 @@ class TestGetDocumentTool:
         )
         store.upsert_chunks([record])
 
-        result = run(server.get_document(doc_id=doc_id))
+        result = await server.get_document(doc_id=doc_id)
 
         assert result["doc_id"] == doc_id
         assert result["content"] == "Hello World chunk content."
         assert result["chunk_count"] == 1
         assert result["metadata"] == {"author": "Test"}
 
-    @pytest.mark.unit
-    def test_get_document_store_error_returns_error(self, monkeypatch):
-        """StoreError from get_document returns a structured error dict (lines 266-267)."""
-        from mcpvectordb import server
-        from mcpvectordb.exceptions import StoreError
-
-        bad_store = MagicMock()
-        bad_store.get_document.side_effect = StoreError("db failure")
-        monkeypatch.setattr("mcpvectordb.server._store", bad_store)
 
-        result = run(server.get_document(doc_id="valid-id"))
+def _failing_store(method: str, exc: Exception) -> SimpleNamespace:
+    """Store stand-in whose only method, ``method``, raises ``exc``."""
+
+    def _raise(*_args, **_kwargs):
+        raise exc
+
+    return SimpleNamespace(**{method: _raise})
+
+
+# (store method that fails, tool call, StoreError message prefix)
+_STORE_ERROR_CASES = [
+    pytest.param(
+        "search",
+        lambda: server.search(query="test query"),
+        "Search failed",
+        id="search",
+    ),
+    pytest.param(
+        "list_documents",
+        lambda: server.list_documents(),
+        "list_documents failed",
+        id="list_documents",
+    ),
+    pytest.param(
+        "list_libraries",
+        lambda: server.list_libraries(),
+        "list_libraries failed",
+        id="list_libraries",
+    ),
+    pytest.param(
+        "delete_document",
+        lambda: server.delete_document(doc_id="valid-id"),
+        "delete_document failed",
+        id="delete_document",
+    ),
+    pytest.param(
+        "get_document",
+        lambda: server.get_document(doc_id="valid-id"),
+        "get_document failed",
+        id="get_document",
+    ),
+]
+
+
+@pytest.mark.no_store
+@pytest.mark.usefixtures("_patch_embedder")
+class TestStoreErrorResponses:
+    """Store failures in the search/list/delete/get tools become error dicts."""
+
+    @pytest.mark.unit
+    @pytest.mark.parametrize(("method", "call", "message"), _STORE_ERROR_CASES)
+    async def test_store_error_returns_error(self, monkeypatch, method, call, message):
+        """StoreError from the store returns a structured error dict naming the tool."""
+        bad_store = _failing_store(method, StoreError("db failure"))
+        monkeypatch.setattr(server, "_store", bad_store)
+
+        result = await call()
         assert result["status"] == "error"
-        assert "get_document failed" in result["error"]
+        assert message in result["error"]
 
     @pytest.mark.unit
-    def test_get_document_unexpected_exception_returns_error(self, monkeypatch):
-        """Unexpected exception in get_document returns a structured error dict (lines 268-270)."""
-        from mcpvectordb import server
+    @pytest.mark.parametrize(("method", "call", "message"), _STORE_ERROR_CASES)
+    async def test_unexpected_exception_returns_error(
+        self, monkeypatch, method, call, message
+    ):
+        """Any other exception from the store returns a generic internal error dict."""
+        bad_store = _failing_store(method, RuntimeError("unexpected"))
+        monkeypatch.setattr(server, "_store", bad_store)
 
-        bad_store = MagicMock()
-        bad_store.get_document.side_effect = RuntimeError("unexpected")
-        monkeypatch.setattr("mcpvectordb.server._store", bad_store)
-
-        result = run(server.get_document(doc_id="valid-id"))
+        result = await call()
         assert result["status"] == "error"
         assert "Internal error" in result["error"]
 
 
+@pytest.fixture(scope="session")
+def _sse_app():
+    """SSE Starlette app built once; route handlers read settings per request."""
+    return server.mcp.sse_app()
+
+
 class TestOAuthProtectedResourceMetadata:
     """Tests for the /.well-known/oauth-protected-resource endpoint."""
 
     @pytest.fixture
-    def sse_client(self, monkeypatch):
+    def sse_client(self, _sse_app):
         """TestClient backed by the SSE app (includes custom routes)."""
-        from mcpvectordb import server
-
-        return TestClient(server.mcp.sse_app(), raise_server_exceptions=False)
+        return TestClient(_sse_app, raise_server_exceptions=False)
 
     @pytest.mark.unit
     def test_prm_endpoint_returns_200(self, sse_client):
@@ -683,100 +540,79 @@ class TestOAuthProtectedResourceMetadata:
     @pytest.mark.unit
     def test_prm_accessible_without_auth(self, sse_client, monkeypatch):
         """PRM endpoint returns 200 even when OAUTH_ENABLED=true and no Bearer token."""
-        import mcpvectordb.config as config_mod
-
-        monkeypatch.setattr(config_mod.settings, "oauth_enabled", True)
+        monkeypatch.setattr(settings, "oauth_enabled", True)
         response = sse_client.get("/.well-known/oauth-protected-resource")
         assert response.status_code == 200
 
     @pytest.mark.unit
     def test_prm_resource_url_uses_setting(self, sse_client, monkeypatch):
         """When OAUTH_RESOURCE_URL is set, it appears in the response."""
-        import mcpvectordb.config as config_mod
-
         monkeypatch.setattr(
-            config_mod.settings, "oauth_resource_url", "https://mcp.example.com"
+            settings, "oauth_resource_url", "https://mcp.example.com"
         )
         response = sse_client.get("/.well-known/oauth-protected-resource")
         assert response.json()["resource"] == "https://mcp.example.com"
 
 
+class _AuthenticatedUser(SimpleUser):
+    is_authenticated = True
+
+
+class _UserSetter:
+    """Simulate AuthenticationMiddleware by setting scope["user"] before the app."""
+
+    def __init__(self, app: Any) -> None:
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        scope["user"] = _AuthenticatedUser("tester")
+        await self.app(scope, receive, send)
+
+
+def _ok(request: StarletteRequest):
+    return PlainTextResponse("ok")
+
+
+@pytest.fixture(scope="class")
+def auth_clients():
+    """Anonymous and authenticated clients for one _RequireGoogleAuth app.
+
+    Built once per class; each client keeps its portal open until the class ends.
+    """
+    inner_app = Starlette(
+        routes=[
+            Route("/mcp", _ok),
+            Route("/protected", _ok),
+            Route("/.well-known/oauth-protected-resource", _ok),
+        ]
+    )
+    app = _RequireGoogleAuth(inner_app)
+    with (
+        TestClient(app, raise_server_exceptions=False) as anon,
+        TestClient(_UserSetter(app), raise_server_exceptions=False) as authed,
+    ):
+        yield SimpleNamespace(anon=anon, authed=authed)
+
+
 class TestRequireGoogleAuth:
     """Tests for the _RequireGoogleAuth ASGI middleware."""
 
     @pytest.mark.unit
-    def test_returns_401_for_unauthenticated_request(self):
+    def test_returns_401_for_unauthenticated_request(self, auth_clients):
         """Unauthenticated request to a non-well-known path gets 401."""
-        from mcpvectordb.server import _RequireGoogleAuth
-        from starlette.applications import Starlette
-        from starlette.requests import Request as StarletteRequest
-        from starlette.responses import PlainTextResponse
-        from starlette.routing import Route
-
-        def homepage(request: StarletteRequest):
-            return PlainTextResponse("ok")
-
-        inner_app = Starlette(routes=[Route("/mcp", homepage)])
-        app = _RequireGoogleAuth(inner_app)
-        client = TestClient(app, raise_server_exceptions=False)
-        response = client.get("/mcp")
+        response = auth_clients.anon.get("/mcp")
         assert response.status_code == 401
 
     @pytest.mark.unit
-    def test_well_known_passes_without_auth(self):
+    def test_well_known_passes_without_auth(self, auth_clients):
         """/.well-known/* requests bypass the auth check."""
-        from mcpvectordb.server import _RequireGoogleAuth
-        from starlette.applications import Starlette
-        from starlette.requests import Request as StarletteRequest
-        from starlette.responses import PlainTextResponse
-        from starlette.routing import Route
-
-        def well_known(request: StarletteRequest):
-            return PlainTextResponse("metadata")
-
-        inner_app = Starlette(
-            routes=[Route("/.well-known/oauth-protected-resource", well_known)]
-        )
-        app = _RequireGoogleAuth(inner_app)
-        client = TestClient(app, raise_server_exceptions=False)
-        response = client.get("/.well-known/oauth-protected-resource")
+        response = auth_clients.anon.get("/.well-known/oauth-protected-resource")
         assert response.status_code == 200
 
     @pytest.mark.unit
-    def test_authenticated_request_passes_through(self):
+    def test_authenticated_request_passes_through(self, auth_clients):
         """Requests with is_authenticated=True on user are forwarded."""
-        from typing import Any as TypingAny
-
-        from mcpvectordb.server import _RequireGoogleAuth
-        from starlette.applications import Starlette
-        from starlette.authentication import SimpleUser
-        from starlette.requests import Request as StarletteRequest
-        from starlette.responses import PlainTextResponse
-        from starlette.routing import Route
-        from starlette.types import Receive, Scope, Send
-
-        class _AuthenticatedUser(SimpleUser):
-            is_authenticated = True
-
-        def homepage(request: StarletteRequest):
-            return PlainTextResponse("ok")
-
-        # Simulate AuthenticationMiddleware by setting scope["user"] before
-        # _RequireGoogleAuth runs. Wrap: _UserSetter → _RequireGoogleAuth → Starlette
-        class _UserSetter:
-            def __init__(self, app: TypingAny) -> None:
-                self.app = app
-
-            async def __call__(
-                self, scope: Scope, receive: Receive, send: Send
-            ) -> None:
-                scope["user"] = _AuthenticatedUser("tester")
-                await self.app(scope, receive, send)
-
-        inner_app = Starlette(routes=[Route("/protected", homepage)])
-        app = _UserSetter(_RequireGoogleAuth(inner_app))
-        client = TestClient(app, raise_server_exceptions=False)
-        response = client.get("/protected")
+        response = auth_clients.authed.get("/protected")
         assert response.status_code == 200
 
 
@@ -786,22 +622,14 @@ class TestValidateOAuthConfig:
     @pytest.mark.unit
     def test_disabled_oauth_passes(self, monkeypatch):
         """_validate_oauth_config does nothing when OAUTH_ENABLED=false."""
-        import mcpvectordb.config as config_mod
-        from mcpvectordb.server import _validate_oauth_config
-
-        monkeypatch.setattr(config_mod.settings, "oauth_enabled", False)
+        monkeypatch.setattr(settings, "oauth_enabled", False)
         _validate_oauth_config()  # should not raise
 
     @pytest.mark.unit
     def test_stdio_with_oauth_logs_warning(self, monkeypatch, caplog):
         """OAUTH_ENABLED=true with stdio transport logs a warning and returns."""
-        import logging
-
-        import mcpvectordb.config as config_mod
-        from mcpvectordb.server import _validate_oauth_config
-
-        monkeypatch.setattr(config_mod.settings, "oauth_enabled", True)
-        monkeypatch.setattr(config_mod.settings, "mcp_transport", "stdio")
+        monkeypatch.setattr(settings, "oauth_enabled", True)
+        monkeypatch.setattr(settings, "mcp_transport", "stdio")
 
         with caplog.at_level(logging.WARNING, logger="mcpvectordb.server"):
             _validate_oauth_config()
@@ -811,12 +639,9 @@ class TestValidateOAuthConfig:
     @pytest.mark.unit
     def test_missing_client_id_raises(self, monkeypatch):
         """OAUTH_ENABLED=true without client_id raises ValueError."""
-        import mcpvectordb.config as config_mod
-        from mcpvectordb.server import _validate_oauth_config
-
-        monkeypatch.setattr(config_mod.settings, "oauth_enabled", True)
-        monkeypatch.setattr(config_mod.settings, "mcp_transport", "streamable-http")
-        monkeypatch.setattr(config_mod.settings, "oauth_client_id", None)
+        monkeypatch.setattr(settings, "oauth_enabled", True)
+        monkeypatch.setattr(settings, "mcp_transport", "streamable-http")
+        monkeypatch.setattr(settings, "oauth_client_id", None)
 
         with pytest.raises(ValueError, match="OAUTH_CLIENT_ID"):
             _validate_oauth_config()
@@ -824,126 +649,101 @@ class TestValidateOAuthConfig:
     @pytest.mark.unit
     def test_valid_oauth_config_passes(self, monkeypatch):
         """OAUTH_ENABLED=true with client_id and streamable-http passes without error."""
-        import mcpvectordb.config as config_mod
-        from mcpvectordb.server import _validate_oauth_config
-
-        monkeypatch.setattr(config_mod.settings, "oauth_enabled", True)
-        monkeypatch.setattr(config_mod.settings, "mcp_transport", "streamable-http")
+        monkeypatch.setattr(settings, "oauth_enabled", True)
+        monkeypatch.setattr(settings, "mcp_transport", "streamable-http")
         monkeypatch.setattr(
-            config_mod.settings,
+            settings,
             "oauth_client_id",
             "test.apps.googleusercontent.com",
         )
         _validate_oauth_config()  # should not raise
 
 
+@pytest.fixture
+def main_env(tmp_path, monkeypatch):
+    """Patch what main() touches besides the transport; return mcp.run's call log."""
+    run_calls: list[dict] = []
+    monkeypatch.setattr(server.mcp, "run", lambda **kwargs: run_calls.append(kwargs))
+    monkeypatch.setattr(server, "get_embedder", lambda: None)
+    # lancedb_uri must be a real writable path so mkdir() succeeds
+    monkeypatch.setattr(settings, "lancedb_uri", str(tmp_path / "lancedb"))
+    monkeypatch.setattr(settings, "fastembed_cache_path", None)
+    return run_calls
+
+
 class TestFrozenBundleContext:
     """Tests for PyInstaller frozen-bundle detection in main()."""
 
     @pytest.mark.unit
-    def test_frozen_sets_fastembed_cache_env_var(self, tmp_path, monkeypatch):
+    def test_frozen_sets_fastembed_cache_env_var(self, tmp_path, monkeypatch, main_env):
         """When sys.frozen is True, main() sets FASTEMBED_CACHE_PATH to bundled cache."""
-        import os
-
-        import mcpvectordb.config as config_mod
-        import mcpvectordb.server as server_mod
-
         # Simulate a PyInstaller frozen environment
         monkeypatch.setattr(sys, "frozen", True, raising=False)
         monkeypatch.setattr(sys, "_MEIPASS", str(tmp_path), raising=False)
         # Ensure env var is not already set
         monkeypatch.delenv("FASTEMBED_CACHE_PATH", raising=False)
-        monkeypatch.setattr(config_mod.settings, "mcp_transport", "stdio")
-        monkeypatch.setattr(server_mod.mcp, "run", MagicMock())
-        monkeypatch.setattr("mcpvectordb.server.get_embedder", MagicMock())
-        # lancedb_uri must be a real writable path so mkdir() succeeds
-        monkeypatch.setattr(
-            config_mod.settings, "lancedb_uri", str(tmp_path / "lancedb")
-        )
-        monkeypatch.setattr(config_mod.settings, "fastembed_cache_path", None)
+        monkeypatch.setattr(settings, "mcp_transport", "stdio")
 
-        server_mod.main()
+        server.main()
 
         expected = str(tmp_path / "fastembed_cache")
         assert os.environ.get("FASTEMBED_CACHE_PATH") == expected
 
     @pytest.mark.unit
-    def test_frozen_respects_explicit_env_var(self, tmp_path, monkeypatch):
+    def test_frozen_respects_explicit_env_var(self, tmp_path, monkeypatch, main_env):
         """When FASTEMBED_CACHE_PATH is already set, frozen detection does not override it."""
-        import mcpvectordb.config as config_mod
-        import mcpvectordb.server as server_mod
-
         monkeypatch.setattr(sys, "frozen", True, raising=False)
         monkeypatch.setattr(sys, "_MEIPASS", str(tmp_path), raising=False)
         explicit = str(tmp_path / "my_custom_models")
         monkeypatch.setenv("FASTEMBED_CACHE_PATH", explicit)
-        monkeypatch.setattr(config_mod.settings, "mcp_transport", "stdio")
-        monkeypatch.setattr(server_mod.mcp, "run", MagicMock())
-        monkeypatch.setattr("mcpvectordb.server.get_embedder", MagicMock())
-        monkeypatch.setattr(
-            config_mod.settings, "lancedb_uri", str(tmp_path / "lancedb")
-        )
-        monkeypatch.setattr(config_mod.settings, "fastembed_cache_path", None)
-
-        server_mod.main()
+        monkeypatch.setattr(settings, "mcp_transport", "stdio")
 
-        import os
+        server.main()
 
         assert os.environ.get("FASTEMBED_CACHE_PATH") == explicit
 
 
+@pytest.mark.no_store
+@pytest.mark.no_ingest
 class TestMainFunction:
     """Tests for the main() entry point function."""
 
     @pytest.mark.unit
-    def test_main_runs_with_stdio_transport(self, monkeypatch):
+    def test_main_runs_with_stdio_transport(self, monkeypatch, main_env):
         """main() calls mcp.run(transport='stdio') when configured (lines 276-284)."""
-        import mcpvectordb.config as config_mod
-        import mcpvectordb.server as server_mod
+        monkeypatch.setattr(settings, "mcp_transport", "stdio")
 
-        mock_run = MagicMock()
-        monkeypatch.setattr(server_mod.mcp, "run", mock_run)
-        monkeypatch.setattr("mcpvectordb.server.get_embedder", MagicMock())
-        monkeypatch.setattr(config_mod.settings, "mcp_transport", "stdio")
+        server.main()
 
-        server_mod.main()
-
-        mock_run.assert_called_once_with(transport="stdio")
+        assert main_env == [{"transport": "stdio"}]
 
     @pytest.mark.unit
-    def test_main_runs_with_sse_transport(self, monkeypatch):
+    def test_main_runs_with_sse_transport(self, monkeypatch, main_env):
         """main() calls mcp.run with transport='sse' for the sse fallback branch."""
-        import mcpvectordb.config as config_mod
-        import mcpvectordb.server as server_mod
+        monkeypatch.setattr(settings, "mcp_transport", "sse")
+
+        server.main()
+
+        assert main_env == [{"transport": "sse"}]
 
-        mock_run = MagicMock()
-        monkeypatch.setattr(server_mod.mcp, "run", mock_run)
-        monkeypatch.setattr("mcpvectordb.server.get_embedder", MagicMock())
-        monkeypatch.setattr(config_mod.settings, "mcp_transport", "sse")
 
-        server_mod.main()
+@pytest.fixture(scope="module")
+def _upload_app(_sse_app):
+    """Upload-endpoint client built once; the route resolves server globals per call.
 
-        mock_run.assert_called_once_with(transport="sse")
+    Entered as a context manager so one portal thread serves every request in the
+    module instead of one being started per post().
+    """
+    with TestClient(_sse_app, raise_server_exceptions=False) as client:
+        yield client
 
 
 @pytest.fixture
-def upload_client(monkeypatch):
+def upload_client(_upload_app, monkeypatch):
     """TestClient with _ingest_content and _convert patched for upload endpoint tests."""
-    from mcpvectordb import server
-    from mcpvectordb.ingestor import IngestResult
-
-    async def _fake_ingest_content(content, source, library, metadata, store):
-        return IngestResult(
-            status="indexed",
-            doc_id="upload-doc-id",
-            source=source,
-            library=library,
-            chunk_count=2,
-        )
-
-    monkeypatch.setattr("mcpvectordb.server._ingest_content", _fake_ingest_content)
-    monkeypatch.setattr("mcpvectordb.server._convert", lambda path: "# Converted")
-    return TestClient(server.mcp.sse_app(), raise_server_exceptions=False)
+    monkeypatch.setattr(server, "_ingest_content", _fake_ingest_content)
+    monkeypatch.setattr(server, "_convert", lambda path: "# Converted")
+    return _upload_app
 
 
 class TestUploadEndpoint:
@@ -982,10 +782,9 @@ class TestUploadEndpoint:
     @pytest.mark.unit
     def test_upload_unsupported_format_returns_422(self, monkeypatch, upload_client):
         """_convert raising UnsupportedFormatError returns 422 with 'Unsupported' in error."""
-        from mcpvectordb.exceptions import UnsupportedFormatError
-
         monkeypatch.setattr(
-            "mcpvectordb.server._convert",
+            server,
+            "_convert",
             lambda path: (_ for _ in ()).throw(UnsupportedFormatError(".xyz")),
         )
         response = upload_client.post(
@@ -998,22 +797,14 @@ class TestUploadEndpoint:
     @pytest.mark.unit
     def test_upload_library_and_metadata_forwarded(self, monkeypatch, upload_client):
         """Upload correctly forwards library and metadata to _ingest_content."""
-        from mcpvectordb.ingestor import IngestResult
-
         captured: dict = {}
 
         async def _spy(content, source, library, metadata, store):
             captured["library"] = library
             captured["metadata"] = metadata
-            return IngestResult(
-                status="indexed",
-                doc_id="spy-id",
-                source=source,
-                library=library,
-                chunk_count=1,
-            )
+            return await _fake_ingest_content(content, source, library, metadata, store)
 
-        monkeypatch.setattr("mcpvectordb.server._ingest_content", _spy)
+        monkeypatch.setattr(server, "_ingest_content", _spy)
         upload_client.post(
             "/upload",
             files={"file": ("report.txt", b"content", "text/plain")},
@@ -1026,12 +817,11 @@ class TestUploadEndpoint:
     @pytest.mark.unit
     def test_upload_ingestion_error_returns_500(self, monkeypatch, upload_client):
         """IngestionError from _ingest_content returns 500 with 'Ingestion failed' in error."""
-        from mcpvectordb.exceptions import IngestionError
-
-        async def _raise(*args, **kwargs):
-            raise IngestionError("store unavailable")
-
-        monkeypatch.setattr("mcpvectordb.server._ingest_content", _raise)
+        monkeypatch.setattr(
+            server,
+            "_ingest_content",
+            _raising_async(IngestionError("store unavailable")),
+        )
         response = upload_client.post(
             "/upload",
             files={"file": ("test.txt", b"hello", "text/plain")},
@@ -1043,7 +833,8 @@ class TestUploadEndpoint:
     def test_upload_conversion_error_returns_500(self, monkeypatch, upload_client):
         """RuntimeError from _convert returns 500 with 'Conversion failed' in error."""
         monkeypatch.setattr(
-            "mcpvectordb.server._convert",
+            server,
+            "_convert",
             lambda path: (_ for _ in ()).throw(RuntimeError("codec crash")),
         )
         response = upload_client.post(
@@ -1058,52 +849,39 @@ class TestIngestFolderTool:
     """MCP contract tests for the ingest_folder tool handler."""
 
     @pytest.mark.unit
-    def test_ingest_folder_empty_string_returns_error(self):
+    async def test_ingest_folder_empty_string_returns_error(self):
         """folder='' returns error dict."""
-        from mcpvectordb import server
-
-        result = run(server.ingest_folder(folder=""))
+        result = await server.ingest_folder(folder="")
         assert result["status"] == "error"
         assert "error" in result
 
     @pytest.mark.unit
-    def test_ingest_folder_whitespace_returns_error(self):
+    async def test_ingest_folder_whitespace_returns_error(self):
         """folder='  ' (whitespace only) returns error dict."""
-        from mcpvectordb import server
-
-        result = run(server.ingest_folder(folder="   "))
+        result = await server.ingest_folder(folder="   ")
         assert result["status"] == "error"
 
     @pytest.mark.unit
-    def test_ingest_folder_missing_dir_returns_error(self, monkeypatch):
+    async def test_ingest_folder_missing_dir_returns_error(self, monkeypatch):
         """Non-existent folder path returns error dict."""
-        from mcpvectordb import server
-        from mcpvectordb.exceptions import IngestionError
-
-        async def _raise(*args, **kwargs):
-            raise IngestionError("Folder not found")
-
-        monkeypatch.setattr("mcpvectordb.server._ingest_folder", _raise)
+        monkeypatch.setattr(
+            server, "_ingest_folder", _raising_async(IngestionError("Folder not found"))
+        )
 
-        result = run(server.ingest_folder(folder="/does/not/exist"))
+        result = await server.ingest_folder(folder="/does/not/exist")
         assert result["status"] == "error"
         assert "error" in result
 
     @pytest.mark.unit
-    def test_ingest_folder_max_concurrency_invalid_returns_error(self):
+    async def test_ingest_folder_max_concurrency_invalid_returns_error(self):
         """max_concurrency=0 returns error dict."""
-        from mcpvectordb import server
-
-        result = run(server.ingest_folder(folder="/some/path", max_concurrency=0))
+        result = await server.ingest_folder(folder="/some/path", max_concurrency=0)
         assert result["status"] == "error"
         assert "max_concurrency" in result["error"]
 
     @pytest.mark.unit
-    def test_ingest_folder_returns_expected_schema(self, tmp_path, monkeypatch):
+    async def test_ingest_folder_returns_expected_schema(self, tmp_path, monkeypatch):
         """Success case returns dict with all required keys."""
-        from mcpvectordb import server
-        from mcpvectordb.ingestor import BulkIngestResult, IngestResult
-
         async def _fake_ingest_folder(*args, **kwargs):
             return BulkIngestResult(
                 folder=str(tmp_path),
@@ -1132,9 +910,9 @@ class TestIngestFolderTool:
                 errors=[],
             )
 
-        monkeypatch.setattr("mcpvectordb.server._ingest_folder", _fake_ingest_folder)
+        monkeypatch.setattr(server, "_ingest_folder", _fake_ingest_folder)
 
-        result = run(server.ingest_folder(folder=str(tmp_path)))
+        result = await server.ingest_folder(folder=str(tmp_path))
 
         expected_keys = (
             "total_files", "indexed", "replaced",
@@ -1,14 +1,57 @@
 """Tests for store.py — LanceDB read/write/delete, schema, dedup scenarios."""
 
-import json
-import uuid
+import itertools
 from datetime import UTC, datetime
 
+import lancedb
 import numpy as np
 import pytest
+from pydantic import ValidationError
 
 from mcpvectordb.config import settings
-from mcpvectordb.store import ChunkRecord
+from mcpvectordb.exceptions import StoreError
+from mcpvectordb.store import ChunkRecord, Store, _build_where_clause, _open_table
+
+_ID_COUNTER = itertools.count()
+
+
+def _new_id(prefix: str) -> str:
+    """Return a session-unique id; no test depends on ids being real UUIDs."""
+    return f"{prefix}-{next(_ID_COUNTER)}"
+
+
+# No test asserts on creation time, so one timestamp serves every chunk
+_CREATED_AT = datetime.now(UTC).isoformat()
+_EMPTY_METADATA = "{}"  # json.dumps({})
+
+# Stored vectors are never asserted on; a small pool drawn once replaces a fresh
+# random vector (and its tolist() boxing) per chunk. Rotating by chunk_index
+# keeps multi-chunk documents from being all-identical for vector search.
+_EMBEDDING_POOL = (
+    np.random.default_rng(0)
+    .random((8, settings.embedding_dimension), dtype=np.float32)
+    .tolist()
+)
+
+
+# Validated once; _make_chunk copies it with model_copy, which skips re-validating
+# the embedding list on every chunk
+_CHUNK_TEMPLATE = ChunkRecord(
+    id="",
+    doc_id="",
+    library="default",
+    source="test://file.pdf",
+    content_hash="abc123",
+    title="Test Document",
+    content="Some test content for the chunk.",
+    embedding=_EMBEDDING_POOL[0],
+    chunk_index=0,
+    created_at=_CREATED_AT,
+    metadata=_EMPTY_METADATA,
+    file_type="pdf",
+    last_modified="",
+    page=0,
+)
 
 
 def _make_chunk(
@@ -25,32 +68,85 @@ def _make_chunk(
     page: int = 0,
 ) -> ChunkRecord:
     """Build a minimal ChunkRecord for testing."""
-    return ChunkRecord(
-        id=str(uuid.uuid4()),
-        doc_id=doc_id or str(uuid.uuid4()),
-        library=library,
-        source=source,
-        content_hash=content_hash,
-        title="Test Document",
-        content=content,
-        embedding=embedding or np.random.rand(settings.embedding_dimension).astype(np.float32).tolist(),
-        chunk_index=chunk_index,
-        created_at=datetime.now(UTC).isoformat(),
-        metadata=json.dumps({}),
-        file_type=file_type,
-        last_modified=last_modified,
-        page=page,
+    if embedding is None:
+        embedding = _EMBEDDING_POOL[chunk_index % len(_EMBEDDING_POOL)]
+    return _CHUNK_TEMPLATE.model_copy(
+        update={
+            "id": _new_id("chunk"),
+            "doc_id": doc_id or _new_id("doc"),
+            "library": library,
+            "source": source,
+            "content_hash": content_hash,
+            "content": content,
+            "embedding": embedding,
+            "chunk_index": chunk_index,
+            "file_type": file_type,
+            "last_modified": last_modified,
+            "page": page,
+        }
     )
 
 
+def _make_chunks(n: int, **kwargs) -> list[ChunkRecord]:
+    """Build n chunks of one document with chunk_index 0..n-1.
+
+    Shared fields are resolved once; each chunk copies that base and sets only
+    its id, chunk_index and pool embedding.
+    """
+    base = _make_chunk(**kwargs)
+    return [
+        base.model_copy(
+            update={
+                "id": _new_id("chunk"),
+                "chunk_index": i,
+                "embedding": _EMBEDDING_POOL[i % len(_EMBEDDING_POOL)],
+            }
+        )
+        for i in range(n)
+    ]
+
+
+class TestChunkRecordEmbedding:
+    """Validation of the embedding field on ChunkRecord."""
+
+    @pytest.mark.unit
+    @pytest.mark.parametrize(
+        "embedding",
+        [[1, 2.0], (1.0, 2.0), np.array([1.0, 2.0], dtype=np.float32)],
+        ids=["mixed_list", "tuple", "ndarray"],
+    )
+    def test_embedding_normalised_to_float_list(self, embedding):
+        """Any numeric sequence is stored as a plain list of floats."""
+        record = ChunkRecord(**{**_CHUNK_TEMPLATE.model_dump(), "embedding": embedding})
+        assert record.embedding == [1.0, 2.0]
+        assert all(type(x) is float for x in record.embedding)
+
+    @pytest.mark.unit
+    def test_records_from_embedder_rows_compare_equal(self):
+        """Records built from the same float32 row are equal, not ambiguous."""
+        fields = {**_CHUNK_TEMPLATE.model_dump(), "embedding": np.ones(2, np.float32)}
+        assert ChunkRecord(**fields) == ChunkRecord(**fields)
+
+    @pytest.mark.unit
+    @pytest.mark.parametrize(
+        "embedding",
+        [["a", "b"], [[0.0, 1.0]], object(), {"a": 1.0}],
+        ids=["non_numeric", "two_dimensional", "object", "dict"],
+    )
+    def test_invalid_embedding_rejected(self, embedding):
+        """Non-numeric or nested values fail validation."""
+        with pytest.raises(ValidationError):
+            ChunkRecord(**{**_CHUNK_TEMPLATE.model_dump(), "embedding": embedding})
+
+
 class TestStoreUpsertAndRetrieve:
     """Basic write and retrieve operations."""
 
     @pytest.mark.integration
     def test_upsert_and_get_document(self, store):
         """Inserted chunks can be retrieved by doc_id."""
-        doc_id = str(uuid.uuid4())
-        chunks = [_make_chunk(doc_id=doc_id, chunk_index=i) for i in range(3)]
+        doc_id = _new_id("doc")
+        chunks = _make_chunks(3, doc_id=doc_id)
         store.upsert_chunks(chunks)
 
         retrieved = store.get_document(doc_id)
@@ -60,7 +156,7 @@ class TestStoreUpsertAndRetrieve:
     @pytest.mark.integration
     def test_get_document_returns_ordered_chunks(self, store):
         """Chunks come back sorted by chunk_index regardless of insert order."""
-        doc_id = str(uuid.uuid4())
+        doc_id = _new_id("doc")
         # Insert in reverse order
         chunks = [_make_chunk(doc_id=doc_id, chunk_index=i) for i in reversed(range(5))]
         store.upsert_chunks(chunks)
@@ -71,7 +167,7 @@ class TestStoreUpsertAndRetrieve:
     @pytest.mark.integration
     def test_get_document_missing_returns_empty(self, store):
         """get_document for an unknown doc_id returns []."""
-        result = store.get_document(str(uuid.uuid4()))
+        result = store.get_document(_new_id("doc"))
         assert result == []
 
     @pytest.mark.integration
@@ -84,11 +180,10 @@ class TestStoreSearch:
     """Semantic search tests."""
 
     @pytest.mark.integration
-    def test_search_empty_table_returns_empty(self, store):
+    def test_search_empty_table_returns_empty(self, store, query_embedding):
         """Searching an empty table returns [] without raising."""
-        embedding = np.random.rand(settings.embedding_dimension).astype(np.float32).tolist()
         result = store.search(
-            embedding=embedding,
+            embedding=query_embedding,
             query_text="test query",
             top_k=5,
             library=None,
@@ -97,15 +192,14 @@ class TestStoreSearch:
         assert result == []
 
     @pytest.mark.integration
-    def test_search_returns_at_most_top_k(self, store):
+    def test_search_returns_at_most_top_k(self, store, query_embedding):
         """Search returns no more than top_k results."""
-        doc_id = str(uuid.uuid4())
-        chunks = [_make_chunk(doc_id=doc_id, chunk_index=i) for i in range(10)]
+        doc_id = _new_id("doc")
+        chunks = _make_chunks(10, doc_id=doc_id)
         store.upsert_chunks(chunks)
 
-        embedding = np.random.rand(settings.embedding_dimension).astype(np.float32).tolist()
         result = store.search(
-            embedding=embedding,
+            embedding=query_embedding,
             query_text="test query",
             top_k=3,
             library=None,
@@ -114,21 +208,16 @@ class TestStoreSearch:
         assert len(result) <= 3
 
     @pytest.mark.integration
-    def test_search_filters_by_library(self, store):
+    def test_search_filters_by_library(self, store, query_embedding):
         """Search restricted to a library does not return chunks from other libs."""
-        doc_a = str(uuid.uuid4())
-        doc_b = str(uuid.uuid4())
-        chunks_a = [
-            _make_chunk(doc_id=doc_a, library="lib_a", chunk_index=i) for i in range(3)
-        ]
-        chunks_b = [
-            _make_chunk(doc_id=doc_b, library="lib_b", chunk_index=i) for i in range(3)
-        ]
+        doc_a = _new_id("doc")
+        doc_b = _new_id("doc")
+        chunks_a = _make_chunks(3, doc_id=doc_a, library="lib_a")
+        chunks_b = _make_chunks(3, doc_id=doc_b, library="lib_b")
         store.upsert_chunks(chunks_a + chunks_b)
 
-        embedding = np.random.rand(settings.embedding_dimension).astype(np.float32).tolist()
         result = store.search(
-            embedding=embedding,
+            embedding=query_embedding,
             query_text="test query",
             top_k=10,
             library="lib_a",
@@ -143,10 +232,8 @@ class TestStoreDelete:
     @pytest.mark.integration
     def test_delete_removes_chunks(self, store):
         """delete_document removes all chunks for a doc_id."""
-        doc_id = str(uuid.uuid4())
-        store.upsert_chunks(
-            [_make_chunk(doc_id=doc_id, chunk_index=i) for i in range(4)]
-        )
+        doc_id = _new_id("doc")
+        store.upsert_chunks(_make_chunks(4, doc_id=doc_id))
 
         store.delete_document(doc_id)
         assert store.get_document(doc_id) == []
@@ -154,10 +241,8 @@ class TestStoreDelete:
     @pytest.mark.integration
     def test_delete_returns_chunk_count(self, store):
         """delete_document returns the number of chunks deleted."""
-        doc_id = str(uuid.uuid4())
-        store.upsert_chunks(
-            [_make_chunk(doc_id=doc_id, chunk_index=i) for i in range(3)]
-        )
+        doc_id = _new_id("doc")
+        store.upsert_chunks(_make_chunks(3, doc_id=doc_id))
 
         deleted = store.delete_document(doc_id)
         assert deleted == 3
@@ -165,16 +250,20 @@ class TestStoreDelete:
     @pytest.mark.integration
     def test_delete_nonexistent_doc_returns_zero(self, store):
         """Deleting a doc_id that doesn't exist returns 0."""
-        deleted = store.delete_document(str(uuid.uuid4()))
+        deleted = store.delete_document(_new_id("doc"))
         assert deleted == 0
 
     @pytest.mark.integration
     def test_delete_does_not_affect_other_docs(self, store):
         """Deleting one document leaves others intact."""
-        doc_a = str(uuid.uuid4())
-        doc_b = str(uuid.uuid4())
-        store.upsert_chunks([_make_chunk(doc_id=doc_a, chunk_index=0)])
-        store.upsert_chunks([_make_chunk(doc_id=doc_b, chunk_index=0)])
+        doc_a = _new_id("doc")
+        doc_b = _new_id("doc")
+        store.upsert_chunks(
+            [
+                _make_chunk(doc_id=doc_a, chunk_index=0),
+                _make_chunk(doc_id=doc_b, chunk_index=0),
+            ]
+        )
 
         store.delete_document(doc_a)
         assert store.get_document(doc_a) == []
@@ -194,7 +283,7 @@ class TestStoreDedup:
     @pytest.mark.integration
     def test_find_existing_returns_doc_id_and_hash(self, store):
         """find_existing returns correct doc_id and hash after insert."""
-        doc_id = str(uuid.uuid4())
+        doc_id = _new_id("doc")
         source = "file:///path/to/doc.pdf"
         library = "mylib"
         c = _make_chunk(
@@ -209,7 +298,7 @@ class TestStoreDedup:
     @pytest.mark.integration
     def test_same_source_different_library_not_found(self, store):
         """Same source in a different library is not returned."""
-        doc_id = str(uuid.uuid4())
+        doc_id = _new_id("doc")
         source = "file:///shared.pdf"
         store.upsert_chunks(
             [_make_chunk(doc_id=doc_id, source=source, library="lib_a")]
@@ -222,7 +311,7 @@ class TestStoreDedup:
     @pytest.mark.integration
     def test_dedup_scenario_same_hash_same_source_and_library(self, store):
         """Scenario 1: same (source, library) + same hash → find_existing detects it."""
-        doc_id = str(uuid.uuid4())
+        doc_id = _new_id("doc")
         source = "file:///doc.pdf"
         library = "default"
         content_hash = "hash_aaa"
@@ -245,7 +334,7 @@ class TestStoreDedup:
     @pytest.mark.integration
     def test_dedup_scenario_different_hash_same_source_and_library(self, store):
         """Scenario 2: same (source, library) + different hash → replaced."""
-        doc_id = str(uuid.uuid4())
+        doc_id = _new_id("doc")
         source = "file:///doc.pdf"
         library = "default"
 
@@ -260,14 +349,10 @@ class TestStoreDedup:
             ]
         )
 
-        found_id, found_hash = store.find_existing(source, library)
-        assert found_id == doc_id
-        # caller sees it differs from new_hash → replace
-        assert found_hash == "old_hash"
-
-        # Simulate replacement
+        # Reading the old entry back is covered by
+        # test_find_existing_returns_doc_id_and_hash; go straight to the replacement
         store.delete_document(doc_id)
-        new_doc_id = str(uuid.uuid4())
+        new_doc_id = _new_id("doc")
         store.upsert_chunks(
             [
                 _make_chunk(
@@ -279,16 +364,16 @@ class TestStoreDedup:
             ]
         )
 
-        found_id2, found_hash2 = store.find_existing(source, library)
-        assert found_id2 == new_doc_id
-        assert found_hash2 == "new_hash"
+        found_id, found_hash = store.find_existing(source, library)
+        assert found_id == new_doc_id
+        assert found_hash == "new_hash"
 
     @pytest.mark.integration
     def test_dedup_scenario_same_source_different_libraries_independent(self, store):
         """Scenario 3: same source, different libraries are independently indexed."""
         source = "file:///shared.pdf"
-        doc_a = str(uuid.uuid4())
-        doc_b = str(uuid.uuid4())
+        doc_a = _new_id("doc")
+        doc_b = _new_id("doc")
 
         ca = _make_chunk(
             doc_id=doc_a, source=source, library="lib_a", content_hash="hash_a"
@@ -296,8 +381,7 @@ class TestStoreDedup:
         cb = _make_chunk(
             doc_id=doc_b, source=source, library="lib_b", content_hash="hash_b"
         )
-        store.upsert_chunks([ca])
-        store.upsert_chunks([cb])
+        store.upsert_chunks([ca, cb])
 
         id_a, hash_a = store.find_existing(source, "lib_a")
         id_b, hash_b = store.find_existing(source, "lib_b")
@@ -326,10 +410,8 @@ class TestListDocuments:
     @pytest.mark.integration
     def test_list_documents_returns_one_per_doc(self, store):
         """list_documents groups chunks and returns one entry per document."""
-        doc_id = str(uuid.uuid4())
-        store.upsert_chunks(
-            [_make_chunk(doc_id=doc_id, chunk_index=i) for i in range(5)]
-        )
+        doc_id = _new_id("doc")
+        store.upsert_chunks(_make_chunks(5, doc_id=doc_id))
 
         docs = store.list_documents(library=None, limit=20, offset=0)
         assert len(docs) == 1
@@ -344,13 +426,11 @@ class TestListDocuments:
     @pytest.mark.integration
     def test_list_libraries_counts(self, store):
         """list_libraries counts documents and chunks correctly."""
-        doc_a = str(uuid.uuid4())
-        doc_b = str(uuid.uuid4())
-        store.upsert_chunks(
-            [_make_chunk(doc_id=doc_a, library="lib", chunk_index=i) for i in range(3)]
-        )
+        doc_a = _new_id("doc")
+        doc_b = _new_id("doc")
         store.upsert_chunks(
-            [_make_chunk(doc_id=doc_b, library="lib", chunk_index=i) for i in range(2)]
+            _make_chunks(3, doc_id=doc_a, library="lib")
+            + _make_chunks(2, doc_id=doc_b, library="lib")
         )
 
         libs = store.list_libraries()
@@ -362,10 +442,14 @@ class TestListDocuments:
     @pytest.mark.integration
     def test_list_documents_filtered_by_library(self, store):
         """list_documents with library filter returns only docs from that library (lines 263-264)."""
-        doc_a = str(uuid.uuid4())
-        doc_b = str(uuid.uuid4())
-        store.upsert_chunks([_make_chunk(doc_id=doc_a, library="lib_x", chunk_index=0)])
-        store.upsert_chunks([_make_chunk(doc_id=doc_b, library="lib_y", chunk_index=0)])
+        doc_a = _new_id("doc")
+        doc_b = _new_id("doc")
+        store.upsert_chunks(
+            [
+                _make_chunk(doc_id=doc_a, library="lib_x", chunk_index=0),
+                _make_chunk(doc_id=doc_b, library="lib_y", chunk_index=0),
+            ]
+        )
 
         docs = store.list_documents(library="lib_x", limit=20, offset=0)
 
@@ -374,149 +458,96 @@ class TestListDocuments:
         assert docs[0]["library"] == "lib_x"
 
 
+def _lancedb_failure(*args, **kwargs):
+    """Stand-in for a LanceDB entry point that always fails."""
+    raise RuntimeError("lancedb failure")
+
+
+# One entry per Store method that opens the table; each is called with a failing
+# _table() and must raise StoreError rather than leak the LanceDB exception.
+_TABLE_FAILURE_CALLS = [
+    pytest.param(
+        lambda store: store.upsert_chunks([_make_chunk()]), id="upsert_chunks"
+    ),
+    pytest.param(
+        lambda store: store.find_existing("source", "library"), id="find_existing"
+    ),
+    pytest.param(lambda store: store.delete_document("some-id"), id="delete_document"),
+    pytest.param(
+        lambda store: store.search(
+            embedding=_EMBEDDING_POOL[0],
+            query_text="test query",
+            top_k=5,
+            library=None,
+            filter=None,
+        ),
+        id="search",
+    ),
+    pytest.param(lambda store: store.get_document("some-id"), id="get_document"),
+    pytest.param(
+        lambda store: store.list_documents(library=None, limit=20, offset=0),
+        id="list_documents",
+    ),
+    pytest.param(lambda store: store.list_libraries(), id="list_libraries"),
+]
+
+
 class TestStoreErrors:
     """Tests that StoreError is raised when LanceDB operations fail."""
 
+    @pytest.fixture
+    def failing_store(self) -> Store:
+        """Store whose _table() always fails; never connects to LanceDB."""
+        failing = Store(uri="unused", table_name="unused")
+        failing._table = _lancedb_failure
+        return failing
+
     @pytest.mark.unit
     def test_open_table_raises_store_error_on_connect_failure(self, monkeypatch):
         """_open_table raises StoreError when lancedb.connect fails (lines 73-74)."""
-        from unittest.mock import MagicMock
-
-        import lancedb
-
-        from mcpvectordb.exceptions import StoreError
-        from mcpvectordb.store import _open_table
-
-        monkeypatch.setattr(
-            lancedb, "connect", MagicMock(side_effect=RuntimeError("no db"))
-        )
+        monkeypatch.setattr(lancedb, "connect", _lancedb_failure)
 
         with pytest.raises(StoreError):
             _open_table("/invalid/path", "table")
 
     @pytest.mark.unit
-    def test_upsert_chunks_raises_store_error(self, store, monkeypatch):
-        """upsert_chunks raises StoreError when the LanceDB write fails (lines 119-120)."""
-        from unittest.mock import MagicMock
-
-        from mcpvectordb.exceptions import StoreError
-
-        monkeypatch.setattr(
-            store, "_table", MagicMock(side_effect=RuntimeError("write error"))
-        )
-
-        with pytest.raises(StoreError):
-            store.upsert_chunks([_make_chunk()])
-
-    @pytest.mark.unit
-    def test_find_existing_raises_store_error(self, store, monkeypatch):
-        """find_existing raises StoreError on LanceDB failure (lines 150-151)."""
-        from unittest.mock import MagicMock
-
-        from mcpvectordb.exceptions import StoreError
-
-        monkeypatch.setattr(
-            store, "_table", MagicMock(side_effect=RuntimeError("query error"))
-        )
-
-        with pytest.raises(StoreError):
-            store.find_existing("source", "library")
-
-    @pytest.mark.unit
-    def test_delete_document_raises_store_error(self, store, monkeypatch):
-        """delete_document raises StoreError on LanceDB failure (lines 174-175)."""
-        from unittest.mock import MagicMock
-
-        from mcpvectordb.exceptions import StoreError
-
-        monkeypatch.setattr(
-            store, "_table", MagicMock(side_effect=RuntimeError("delete error"))
-        )
-
-        with pytest.raises(StoreError):
-            store.delete_document("some-id")
-
-    @pytest.mark.unit
-    def test_search_raises_store_error(self, store, monkeypatch):
-        """search raises StoreError on LanceDB failure (lines 211-212)."""
-        from unittest.mock import MagicMock
-
-        from mcpvectordb.exceptions import StoreError
-
-        monkeypatch.setattr(
-            store, "_table", MagicMock(side_effect=RuntimeError("search error"))
-        )
-
-        with pytest.raises(StoreError):
-            store.search(
-                embedding=np.random.rand(settings.embedding_dimension).tolist(),
-                query_text="test query",
-                top_k=5,
-                library=None,
-                filter=None,
-            )
-
-    @pytest.mark.unit
-    def test_get_document_raises_store_error(self, store, monkeypatch):
-        """get_document raises StoreError on LanceDB failure (lines 236-237)."""
-        from unittest.mock import MagicMock
-
-        from mcpvectordb.exceptions import StoreError
-
-        monkeypatch.setattr(
-            store, "_table", MagicMock(side_effect=RuntimeError("fetch error"))
-        )
-
-        with pytest.raises(StoreError):
-            store.get_document("some-id")
-
-    @pytest.mark.unit
-    def test_list_documents_raises_store_error(self, store, monkeypatch):
-        """list_documents raises StoreError on LanceDB failure (lines 287-288)."""
-        from unittest.mock import MagicMock
-
-        from mcpvectordb.exceptions import StoreError
-
-        monkeypatch.setattr(
-            store, "_table", MagicMock(side_effect=RuntimeError("list error"))
-        )
-
+    @pytest.mark.parametrize("call", _TABLE_FAILURE_CALLS)
+    def test_table_failure_raises_store_error(self, failing_store, call):
+        """Any LanceDB failure inside a Store method surfaces as StoreError."""
         with pytest.raises(StoreError):
-            store.list_documents(library=None, limit=20, offset=0)
-
-    @pytest.mark.unit
-    def test_list_libraries_raises_store_error(self, store, monkeypatch):
-        """list_libraries raises StoreError on LanceDB failure (lines 326-327)."""
-        from unittest.mock import MagicMock
-
-        from mcpvectordb.exceptions import StoreError
-
-        monkeypatch.setattr(
-            store, "_table", MagicMock(side_effect=RuntimeError("list error"))
-        )
-
-        with pytest.raises(StoreError):
-            store.list_libraries()
+            call(failing_store)
 
 
 class TestStoreFilter:
     """Tests for the filter parameter on Store.search()."""
 
-    @pytest.mark.integration
-    def test_filter_by_file_type(self, store):
-        """filter={'file_type': 'pdf'} excludes chunks with a different file_type."""
-        doc_pdf = str(uuid.uuid4())
-        doc_html = str(uuid.uuid4())
-        store.upsert_chunks(
-            [_make_chunk(doc_id=doc_pdf, file_type="pdf", content="pdf content here")]
+    @pytest.fixture(scope="class")
+    def filter_corpus(self, tmp_path_factory):
+        """Read-only Store seeded once with chunks spanning file types, pages, libs."""
+        corpus = Store(
+            uri=str(tmp_path_factory.mktemp("filter") / "lancedb"),
+            table_name="test_documents",
         )
-        store.upsert_chunks(
-            [_make_chunk(doc_id=doc_html, file_type="html", content="html content here")]
+        corpus.upsert_chunks(
+            [
+                _make_chunk(
+                    library="lib_a", file_type="pdf", page=1, content="pdf page one"
+                ),
+                _make_chunk(
+                    library="lib_a", file_type="html", page=2, content="html page two"
+                ),
+                _make_chunk(
+                    library="lib_b", file_type="pdf", page=2, content="pdf page two"
+                ),
+            ]
         )
+        return corpus
 
-        embedding = np.random.rand(settings.embedding_dimension).astype(np.float32).tolist()
-        results = store.search(
-            embedding=embedding,
+    @pytest.mark.integration
+    def test_filter_by_file_type(self, filter_corpus, query_embedding):
+        """filter={'file_type': 'pdf'} excludes chunks with a different file_type."""
+        results = filter_corpus.search(
+            embedding=query_embedding,
             query_text="content",
             top_k=10,
             library=None,
@@ -526,19 +557,10 @@ class TestStoreFilter:
         assert all(r.file_type == "pdf" for r in results)
 
     @pytest.mark.integration
-    def test_filter_by_page(self, store):
+    def test_filter_by_page(self, filter_corpus, query_embedding):
         """filter={'page': 2} returns only chunks with page == 2."""
-        doc_id = str(uuid.uuid4())
-        store.upsert_chunks(
-            [
-                _make_chunk(doc_id=doc_id, chunk_index=0, page=1, content="page one text"),
-                _make_chunk(doc_id=doc_id, chunk_index=1, page=2, content="page two text"),
-            ]
-        )
-
-        embedding = np.random.rand(settings.embedding_dimension).astype(np.float32).tolist()
-        results = store.search(
-            embedding=embedding,
+        results = filter_corpus.search(
+            embedding=query_embedding,
             query_text="page",
             top_k=10,
             library=None,
@@ -548,39 +570,29 @@ class TestStoreFilter:
         assert all(r.page == 2 for r in results)
 
     @pytest.mark.integration
-    def test_filter_combined_with_library(self, store):
+    def test_filter_combined_with_library(self, filter_corpus, query_embedding):
         """library param and filter dict are AND-ed together."""
-        doc_a = str(uuid.uuid4())
-        doc_b = str(uuid.uuid4())
-        store.upsert_chunks(
-            [_make_chunk(doc_id=doc_a, library="lib_a", file_type="pdf")]
-        )
-        store.upsert_chunks(
-            [_make_chunk(doc_id=doc_b, library="lib_a", file_type="html")]
-        )
-
-        embedding = np.random.rand(settings.embedding_dimension).astype(np.float32).tolist()
-        results = store.search(
-            embedding=embedding,
+        results = filter_corpus.search(
+            embedding=query_embedding,
             query_text="test",
             top_k=10,
             library="lib_a",
             filter={"file_type": "pdf"},
         )
+        assert results
         assert all(r.library == "lib_a" and r.file_type == "pdf" for r in results)
 
     @pytest.mark.unit
-    def test_invalid_filter_key_raises_store_error(self, store, monkeypatch):
+    def test_invalid_filter_key_raises_store_error(
+        self, store, monkeypatch, query_embedding
+    ):
         """A filter key with invalid characters raises StoreError."""
-        from mcpvectordb.exceptions import StoreError
-
         monkeypatch.setattr(
             store, "_table", lambda: None
         )  # table not needed — error is raised before use
-        embedding = np.random.rand(settings.embedding_dimension).astype(np.float32).tolist()
         with pytest.raises(StoreError):
             store.search(
-                embedding=embedding,
+                embedding=query_embedding,
                 query_text="test",
                 top_k=5,
                 library=None,
@@ -588,53 +600,33 @@ class TestStoreFilter:
             )
 
     @pytest.mark.unit
-    def test_build_where_clause_library_only(self):
-        """_build_where_clause with library and no filter returns library condition."""
-        from mcpvectordb.store import _build_where_clause
-
-        result = _build_where_clause("mylib", None)
-        assert result == "library = 'mylib'"
-
-    @pytest.mark.unit
-    def test_build_where_clause_filter_only(self):
-        """_build_where_clause with no library and a filter returns filter condition."""
-        from mcpvectordb.store import _build_where_clause
-
-        result = _build_where_clause(None, {"file_type": "pdf"})
-        assert result == "file_type = 'pdf'"
-
-    @pytest.mark.unit
-    def test_build_where_clause_combined(self):
-        """_build_where_clause combines library and filter with AND."""
-        from mcpvectordb.store import _build_where_clause
-
-        result = _build_where_clause("lib_a", {"file_type": "pdf"})
-        assert result == "library = 'lib_a' AND file_type = 'pdf'"
-
-    @pytest.mark.unit
-    def test_build_where_clause_none_when_empty(self):
-        """_build_where_clause returns None when both library and filter are empty."""
-        from mcpvectordb.store import _build_where_clause
-
-        assert _build_where_clause(None, None) is None
-        assert _build_where_clause(None, {}) is None
-
-    @pytest.mark.unit
-    def test_build_where_clause_int_value_unquoted(self):
-        """Integer filter values are not quoted in the WHERE clause."""
-        from mcpvectordb.store import _build_where_clause
-
-        result = _build_where_clause(None, {"page": 3})
-        assert result == "page = 3"
-
-    @pytest.mark.unit
-    def test_build_where_clause_escapes_single_quotes(self):
-        """Single quotes in values are escaped to prevent SQL injection."""
-        from mcpvectordb.store import _build_where_clause
-
-        result = _build_where_clause("lib's", {"file_type": "it's a pdf"})
-        assert "lib''s" in result
-        assert "it''s a pdf" in result
+    @pytest.mark.parametrize(
+        ("library", "filt", "expected"),
+        [
+            pytest.param("mylib", None, "library = 'mylib'", id="library_only"),
+            pytest.param(
+                None, {"file_type": "pdf"}, "file_type = 'pdf'", id="filter_only"
+            ),
+            pytest.param(
+                "lib_a",
+                {"file_type": "pdf"},
+                "library = 'lib_a' AND file_type = 'pdf'",
+                id="combined",
+            ),
+            pytest.param(None, None, None, id="none_when_empty"),
+            pytest.param(None, {}, None, id="none_when_empty_filter"),
+            pytest.param(None, {"page": 3}, "page = 3", id="int_value_unquoted"),
+            pytest.param(
+                "lib's",
+                {"file_type": "it's a pdf"},
+                "library = 'lib''s' AND file_type = 'it''s a pdf'",
+                id="escapes_single_quotes",
+            ),
+        ],
+    )
+    def test_build_where_clause(self, library, filt, expected):
+        """_build_where_clause ANDs library and filter conditions, or returns None."""
+        assert _build_where_clause(library, filt) == expected
 
 
 class TestStoreSchemaMigration:
@@ -643,12 +635,8 @@ class TestStoreSchemaMigration:
     @pytest.mark.integration
     def test_migrate_adds_new_columns_to_old_table(self, lancedb_dir):
         """_open_table adds file_type, last_modified, page to a pre-existing table."""
-        import lancedb as _lancedb
-
-        from mcpvectordb.store import _open_table
-
         # Create a table with the old schema (no new fields)
-        db = _lancedb.connect(str(lancedb_dir))
+        db = lancedb.connect(str(lancedb_dir))
         db.create_table(
             "old_docs",
             data=[
@@ -660,7 +648,7 @@ class TestStoreSchemaMigration:
                     "content_hash": "abc",
                     "title": "T",
                     "content": "c",
-                    "embedding": [0.0] * settings.embedding_dimension,
+                    "embedding": np.zeros(settings.embedding_dimension, np.float32),
                     "chunk_index": 0,
                     "created_at": "2024-01-01",
                     "metadata": "{}",
@@ -679,8 +667,6 @@ class TestStoreSchemaMigration:
     @pytest.mark.integration
     def test_migrate_is_idempotent(self, lancedb_dir):
         """Opening an already-migrated table a second time does not raise."""
-        from mcpvectordb.store import _open_table
-
         # First open creates the table with the current schema
         _open_table(str(lancedb_dir), "docs")
         # Second open should run migration but find nothing to add
@@ -691,15 +677,14 @@ class TestStoreHybridSearch:
     """Hybrid search (BM25 + vector) tests."""
 
     @pytest.mark.integration
-    def test_hybrid_finds_exact_term(self, store):
+    def test_hybrid_finds_exact_term(self, store, query_embedding):
         """Hybrid search retrieves a document by an exact term BM25 can match."""
-        doc_id = str(uuid.uuid4())
+        doc_id = _new_id("doc")
         store.upsert_chunks(
             [_make_chunk(doc_id=doc_id, content="deployment error code E-4021 in prod")]
         )
-        embedding = np.random.rand(settings.embedding_dimension).astype(np.float32).tolist()
         results = store.search(
-            embedding=embedding,
+            embedding=query_embedding,
             query_text="E-4021",
             top_k=5,
             library=None,
@@ -708,11 +693,10 @@ class TestStoreHybridSearch:
         assert any("E-4021" in r.content for r in results)
 
     @pytest.mark.integration
-    def test_hybrid_empty_table_returns_empty(self, store):
+    def test_hybrid_empty_table_returns_empty(self, store, query_embedding):
         """Hybrid search on empty table returns [] without raising."""
-        embedding = np.random.rand(settings.embedding_dimension).astype(np.float32).tolist()
         results = store.search(
-            embedding=embedding,
+            embedding=query_embedding,
             query_text="anything",
             top_k=5,
             library=None,
@@ -721,18 +705,17 @@ class TestStoreHybridSearch:
         assert results == []
 
     @pytest.mark.integration
-    def test_hybrid_respects_library_filter(self, store):
+    def test_hybrid_respects_library_filter(self, store, query_embedding):
         """Hybrid search with library filter excludes results from other libraries."""
-        doc_a, doc_b = str(uuid.uuid4()), str(uuid.uuid4())
+        doc_a, doc_b = _new_id("doc"), _new_id("doc")
         store.upsert_chunks(
-            [_make_chunk(doc_id=doc_a, library="lib_a", content="alpha omega delta")]
-        )
-        store.upsert_chunks(
-            [_make_chunk(doc_id=doc_b, library="lib_b", content="alpha omega delta")]
+            [
+                _make_chunk(doc_id=doc_a, library="lib_a", content="alpha omega delta"),
+                _make_chunk(doc_id=doc_b, library="lib_b", content="alpha omega delta"),
+            ]
         )
-        embedding = np.random.rand(settings.embedding_dimension).astype(np.float32).tolist()
         results = store.search(
-            embedding=embedding,
+            embedding=query_embedding,
             query_text="alpha omega",
             top_k=10,
             library="lib_a",
@@ -741,16 +724,15 @@ class TestStoreHybridSearch:
         assert all(r.library == "lib_a" for r in results)
 
     @pytest.mark.unit
-    def test_hybrid_falls_back_to_vector_when_disabled(self, store, monkeypatch):
+    def test_hybrid_falls_back_to_vector_when_disabled(
+        self, store, monkeypatch, query_embedding
+    ):
         """Disabling hybrid_search_enabled falls back to vector-only search."""
-        import mcpvectordb.store as store_module
-
-        monkeypatch.setattr(store_module.settings, "hybrid_search_enabled", False)
-        doc_id = str(uuid.uuid4())
+        monkeypatch.setattr(settings, "hybrid_search_enabled", False)
+        doc_id = _new_id("doc")
         store.upsert_chunks([_make_chunk(doc_id=doc_id)])
-        embedding = np.random.rand(settings.embedding_dimension).astype(np.float32).tolist()
         results = store.search(
-            embedding=embedding,
+            embedding=query_embedding,
             query_text="test",
             top_k=5,
             library=None,
@@ -759,13 +741,9 @@ class TestStoreHybridSearch:
         assert isinstance(results, list)
 
     @pytest.mark.unit
-    def test_refine_factor_applied(self, store, monkeypatch):
+    def test_refine_factor_applied(self, store, monkeypatch, query_embedding):
         """search() calls refine_factor() with the configured value on both paths."""
-        from unittest.mock import MagicMock, patch
-
-        import mcpvectordb.store as store_module
-
-        doc_id = str(uuid.uuid4())
+        doc_id = _new_id("doc")
         store.upsert_chunks([_make_chunk(doc_id=doc_id)])
 
         captured: list[int] = []
@@ -790,11 +768,10 @@ class TestStoreHybridSearch:
             tbl.search = recording_search
             return tbl
 
-        monkeypatch.setattr(store_module.settings, "hybrid_search_enabled", False)
+        monkeypatch.setattr(settings, "hybrid_search_enabled", False)
         monkeypatch.setattr(store, "_table", patched_table)
-        embedding = np.random.rand(settings.embedding_dimension).astype(np.float32).tolist()
         store.search(
-            embedding=embedding,
+            embedding=query_embedding,
             query_text="test",
             top_k=5,
             library=None,
@@ -2,27 +2,41 @@
 
 import logging
 from pathlib import Path
-from unittest.mock import MagicMock
+from types import SimpleNamespace
 
 import pytest
 
 import mcpvectordb.server as server_module
 from mcpvectordb.server import _validate_tls_config
 
+_SETTINGS_DEFAULTS = {
+    "tls_enabled": False,
+    "mcp_transport": "streamable-http",
+    "tls_cert_file": None,
+    "tls_key_file": None,
+}
 
-def _make_settings(**kwargs) -> MagicMock:
-    """Return a MagicMock that mimics Settings with the given overrides."""
-    defaults = {
-        "tls_enabled": False,
-        "mcp_transport": "streamable-http",
-        "tls_cert_file": None,
-        "tls_key_file": None,
-    }
-    defaults.update(kwargs)
-    mock = MagicMock()
-    for k, v in defaults.items():
-        setattr(mock, k, v)
-    return mock
+
+def _make_settings(**kwargs) -> SimpleNamespace:
+    """Return a stand-in for Settings with the given overrides.
+
+    _validate_tls_config only reads these four attributes, so a plain namespace
+    is enough; no call tracking is needed.
+    """
+    return SimpleNamespace(**{**_SETTINGS_DEFAULTS, **kwargs})
+
+
+@pytest.fixture(scope="session")
+def tls_files(tmp_path_factory: pytest.TempPathFactory) -> Path:
+    """Directory holding placeholder cert.pem and key.pem, written once.
+
+    _validate_tls_config only checks that the files exist, so tests share them
+    read-only; the "not found" tests point at siblings that are never created.
+    """
+    tls_dir = tmp_path_factory.mktemp("tls")
+    (tls_dir / "cert.pem").write_text("cert")
+    (tls_dir / "key.pem").write_text("key")
+    return tls_dir
 
 
 @pytest.mark.unit
@@ -73,15 +87,13 @@ def test_missing_both_raises(monkeypatch: pytest.MonkeyPatch) -> None:
 
 @pytest.mark.unit
 def test_missing_key_raises(
-    monkeypatch: pytest.MonkeyPatch, tmp_path: Path
+    monkeypatch: pytest.MonkeyPatch, tls_files: Path
 ) -> None:
     """TLS enabled, cert file exists, key is None — ValueError naming TLS_KEY_FILE."""
-    cert = tmp_path / "cert.pem"
-    cert.write_text("cert")
     mock_settings = _make_settings(
         tls_enabled=True,
         mcp_transport="streamable-http",
-        tls_cert_file=str(cert),
+        tls_cert_file=str(tls_files / "cert.pem"),
         tls_key_file=None,
     )
     monkeypatch.setattr(server_module, "settings", mock_settings)
@@ -91,16 +103,14 @@ def test_missing_key_raises(
 
 @pytest.mark.unit
 def test_cert_not_found_raises(
-    monkeypatch: pytest.MonkeyPatch, tmp_path: Path
+    monkeypatch: pytest.MonkeyPatch, tls_files: Path
 ) -> None:
     """TLS enabled, cert path does not exist on disk — ValueError with 'not found'."""
-    key = tmp_path / "key.pem"
-    key.write_text("key")
     mock_settings = _make_settings(
         tls_enabled=True,
         mcp_transport="streamable-http",
-        tls_cert_file=str(tmp_path / "missing_cert.pem"),
-        tls_key_file=str(key),
+        tls_cert_file=str(tls_files / "missing_cert.pem"),
+        tls_key_file=str(tls_files / "key.pem"),
     )
     monkeypatch.setattr(server_module, "settings", mock_settings)
     with pytest.raises(ValueError, match="not found"):
@@ -109,16 +119,14 @@ def test_cert_not_found_raises(
 
 @pytest.mark.unit
 def test_key_not_found_raises(
-    monkeypatch: pytest.MonkeyPatch, tmp_path: Path
+    monkeypatch: pytest.MonkeyPatch, tls_files: Path
 ) -> None:
     """TLS enabled, key path does not exist on disk — ValueError with 'not found'."""
-    cert = tmp_path / "cert.pem"
-    cert.write_text("cert")
     mock_settings = _make_settings(
         tls_enabled=True,
         mcp_transport="streamable-http",
-        tls_cert_file=str(cert),
-        tls_key_file=str(tmp_path / "missing_key.pem"),
+        tls_cert_file=str(tls_files / "cert.pem"),
+        tls_key_file=str(tls_files / "missing_key.pem"),
     )
     monkeypatch.setattr(server_module, "settings", mock_settings)
     with pytest.raises(ValueError, match="not found"):
@@ -127,18 +135,14 @@ def test_key_not_found_raises(
 
 @pytest.mark.unit
 def test_valid_config_no_error(
-    monkeypatch: pytest.MonkeyPatch, tmp_path: Path
+    monkeypatch: pytest.MonkeyPatch, tls_files: Path
 ) -> None:
     """TLS enabled, both files exist — no raise."""
-    cert = tmp_path / "cert.pem"
-    key = tmp_path / "key.pem"
-    cert.write_text("cert")
-    key.write_text("key")
     mock_settings = _make_settings(
         tls_enabled=True,
         mcp_transport="streamable-http",
-        tls_cert_file=str(cert),
-        tls_key_file=str(key),
+        tls_cert_file=str(tls_files / "cert.pem"),
+        tls_key_file=str(tls_files / "key.pem"),
     )
     monkeypatch.setattr(server_module, "settings", mock_settings)
     _validate_tls_config()  # must not raise